@@ -2,16 +2,19 @@ import asyncio
 import hashlib
 import io
 import logging
+import os
 import pathlib
+import threading
 import uuid
 from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from copy import deepcopy
 from dataclasses import replace
 from os import PathLike
-from types import SimpleNamespace
-from typing import Any
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, AsyncIterator, Iterable, Mapping, NamedTuple
 
-import glyphsLib
 import openstep_plist
 from fontra.backends.base import WritableBaseBackend
 from fontra.backends.filewatcher import Change
@@ -47,28 +50,35 @@ from fontra.core.varutils import (
     makeDenseLocation,
     mapAxesFromUserSpaceToSourceSpace,
 )
-from fontTools.designspaceLib import DesignSpaceDocument
-from fontTools.feaLib.error import FeatureLibError, IncludedFeaNotFound
-from fontTools.feaLib.parser import Parser as FeatureParser
 from fontTools.misc.transform import DecomposedTransform
-from fontTools.ufoLib.filenames import userNameToFileName
-from glyphsLib.builder.axes import (
-    get_axis_definitions,
-    get_regular_master,
-    to_designspace_axes,
-)
-from glyphsLib.builder.smart_components import Pole
-from glyphsLib.types import Transform as GSTransform
 
+from .parsecache import ParseCache
+from .scanner import UnparsedGlyphData, scanGlyphsFile
+from .splicewriter import SpliceWriter
 from .utils import (
+    LazyModule,
     convertMatchesToTuples,
+    glyphTextDigest,
     matchTreeFont,
-    matchTreeGlyph,
+    openstepPlistAndDigestFromPath,
     openstepPlistDumps,
+    openstepPlistDumpsGlyph,
     openstepPlistFromPath,
+    openstepPlistsFromPathsParallel,
+    openstepPlistsFromTextsParallel,
+    parallelLoadingChunkSize,
     splitLocation,
 )
 
+# glyphsLib, designspaceLib, feaLib and ufoLib are slow to import, and Fontra
+# imports all backends at startup: they are imported when they are first used
+glyphsLib = LazyModule("glyphsLib")
+smartComponents = LazyModule("glyphsLib.builder.smart_components")
+designspaceLib = LazyModule("fontTools.designspaceLib")
+feaLibError = LazyModule("fontTools.feaLib.error")
+feaLibParser = LazyModule("fontTools.feaLib.parser")
+ufoLibFilenames = LazyModule("fontTools.ufoLib.filenames")
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,6 +86,15 @@ class GlyphsBackendError(Exception):
     pass
 
 
+class GlyphDataSnapshot(NamedTuple):
+    """A read-only view of the glyph map or the glyph infos, shared between
+    callers. A new snapshot, with a higher version, is made when the data changes.
+    """
+
+    version: int
+    data: Mapping[str, Any]
+
+
 rootInfoNames = [
     "familyName",
     "versionMajor",
@@ -117,8 +136,112 @@ GS_FORMAT_3_KERN_SIDES = [
 
 invalidFeaturesUserDataKey = "xyz.fontra.invalid-features"
 
+# The GSFont attributes that are changed by writing kerning or features
+GS_KERNING_ATTRS = ["kerningLTR", "kerningRTL", "kerningVertical"]
+GS_FEATURES_ATTRS = ["classes", "featurePrefixes", "features", "userData"]
+
+GS_KERNING_RAW_KEYS = {
+    # GSFont kerning attribute: (raw font data key, write if empty)
+    2: {"kerningLTR": ("kerning", False)},
+    3: {
+        "kerningLTR": ("kerningLTR", True),
+        "kerningRTL": ("kerningRTL", False),
+        "kerningVertical": ("kerningVertical", False),
+    },
+}
+
+# The reload pattern key for externally changed raw font data keys, or None if
+# the key isn't served to clients. Changes to keys that aren't listed here, such
+# as "axes", "fontMaster" and "instances", reload the whole font.
+RAW_FONT_DATA_RELOAD_KEYS = {
+    "kerning": "kerning",
+    "kerningLTR": "kerning",
+    "kerningRTL": "kerning",
+    "kerningVertical": "kerning",
+    "vertKerning": "kerning",
+    "classes": "features",
+    "featurePrefixes": "features",
+    "features": "features",
+    "userData": "features",
+    "familyName": "fontInfo",
+    "versionMajor": "fontInfo",
+    "versionMinor": "fontInfo",
+    "properties": "fontInfo",
+    "copyright": "fontInfo",
+    "designer": "fontInfo",
+    "designerURL": "fontInfo",
+    "manufacturer": "fontInfo",
+    "manufacturerURL": "fontInfo",
+    "unitsPerEm": "unitsPerEm",
+    ".appVersion": None,
+    "DisplayStrings": None,
+    "date": None,
+    "disablesAutomaticAlignment": None,
+    "disablesNiceNames": None,
+    "gridLength": None,
+    "gridSubDivision": None,
+    "keepAlternatesTogether": None,
+    "keyboardIncrement": None,
+    "note": None,
+    "settings": None,
+}
+
+# Font custom parameters that glyphsLib uses for the axes
+AXIS_CUSTOM_PARAMETER_NAMES = {
+    "Axes",
+    "Axis Location",
+    "Axis Mappings",
+    "Variable Font Origin",
+    "Virtual Master",
+}
+
 
 class GlyphsBackend(WatchableBackend, WritableBaseBackend):
+    # When True, glyph records are only scanned for their name, code points, infos
+    # and kerning groups at load time. The rest of the glyph data gets parsed
+    # when it is needed.
+    lazyLoading = False
+
+    # When True, the font is opened like with lazyLoading, after which the glyph
+    # data is parsed in the background, this many glyphs at a time. Glyphs that
+    # are needed before that are parsed right away.
+    backgroundLoading = False
+    backgroundLoadingChunkSize = 100
+
+    # When set, parsed font data is stored in this directory, so the font can be
+    # opened again without parsing the files that didn't change
+    parseCacheDir: PathLike | None = None
+
+    # When set, changes are written to disk at most once per this many seconds,
+    # instead of on every change. flush() and aclose() write pending changes
+    # immediately.
+    flushInterval: float | None = None
+
+    # When set, at most this many glyphs are kept parsed as GSGlyph objects. The
+    # least recently used ones are replaced by placeholders again, they are
+    # parsed from the raw glyph data when they are needed.
+    maxParsedGlyphs: int | None = None
+
+    # When set, getGlyph() keeps the converted VariableGlyph objects in a least
+    # recently used cache, of at most this many bytes (estimated).
+    glyphCacheMaxBytes: int | None = None
+
+    # The maximum number of worker threads used to convert glyphs for getGlyph()
+    # and getGlyphs()
+    glyphReadWorkers = 4
+
+    # The number of processes getGlyphs() uses to parse lazily loaded glyph data
+    # in parallel, or 0 to parse it sequentially
+    glyphBatchWorkers = 0
+
+    # getGlyphs() converts this many glyphs per trip to a worker thread
+    glyphBatchSize = 50
+
+    # When True, glyphs that putGlyph() converts directly to raw glyph data are
+    # also converted via glyphsLib, and the results are checked to be the same.
+    # This is meant for testing.
+    checkRawGlyphWriter = False
+
     @classmethod
     def fromPath(cls, path: PathLike) -> WritableFontBackend:
         self = cls()
@@ -127,14 +250,98 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
 
     def __init__(self) -> None:
         super().__init__()
-        self._writeLock = asyncio.Lock()
+        # Reads (getGlyph(), getGlyphs()) run in worker threads, and may run
+        # alongside each other, but not alongside changes
+        self._lock = ReadWriteLock()
+        self._readExecutor: ThreadPoolExecutor | None = None
+        # Guards the state that reads update: the parsed GSGlyphs, lazily parsed
+        # raw glyph data and the glyph cache
+        self._parseLock = threading.RLock()
         self._includedFeaturePaths: list[pathlib.Path] = []
+        self._spliceWriter: SpliceWriter | None = None
+        self._parseCache: ParseCache | None = None
+        self._flushTask: asyncio.Task | None = None
+        self._writesDeferred = False
+        self._resetPendingChanges()
+        self.parsedGlyphCounters = {"hits": 0, "misses": 0, "evictions": 0}
+        self.glyphMap: dict[str, list[int]] = {}
+        self.glyphInfos: dict[str, Any] = {}
+        self.glyphMapVersion = 0
+        self.glyphInfosVersion = 0
+        self._glyphMapSnapshot: GlyphDataSnapshot | None = None
+        self._glyphInfosSnapshot: GlyphDataSnapshot | None = None
+        # The digests of the glyph records as they are, or will be, written to
+        # disk, see getGlyphDigest()
+        self.glyphDigests: dict[str, str] = {}
+        self._backgroundLoadingTask: asyncio.Task | None = None
 
     def _setupFromPath(self, path: PathLike) -> None:
         self.path = pathlib.Path(path)
 
-        rawFontData, rawGlyphsData = self._loadFiles()
+        rawFontData, rawGlyphsData, glyphDigests = self._loadFiles()
         self._setupWithRawData(rawFontData, rawGlyphsData)
+        self.glyphDigests = glyphDigests
+        self._saveParseCache()
+        if self.backgroundLoading:
+            self._startBackgroundLoading()
+
+    @property
+    def _scansGlyphHeaders(self) -> bool:
+        # Whether only the glyph headers are read when the font is loaded
+        return self.lazyLoading or self.backgroundLoading
+
+    def _startBackgroundLoading(self) -> None:
+        if (
+            self._backgroundLoadingTask is not None
+            and not self._backgroundLoadingTask.done()
+        ):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Without an event loop, glyphs are only parsed when they are needed
+            return
+        self._backgroundLoadingTask = asyncio.create_task(
+            self._loadGlyphsInBackground()
+        )
+
+    async def _loadGlyphsInBackground(self) -> None:
+        try:
+            glyphIndex = 0
+            while True:
+                # Writes wait for the current chunk only
+                async with self._lock.reading():
+                    rawGlyphsData = self.rawGlyphsData
+                    glyphIndices = []
+                    while (
+                        glyphIndex < len(rawGlyphsData)
+                        and len(glyphIndices) < self.backgroundLoadingChunkSize
+                    ):
+                        if isinstance(rawGlyphsData[glyphIndex], UnparsedGlyphData):
+                            glyphIndices.append(glyphIndex)
+                        glyphIndex += 1
+                    if glyphIndices:
+                        await self._runReader(self._parseRawGlyphsData, glyphIndices)
+                    elif any(
+                        isinstance(glyphData, UnparsedGlyphData)
+                        for glyphData in rawGlyphsData
+                    ):
+                        # The glyph data was reloaded or compacted, start over
+                        glyphIndex = 0
+                    else:
+                        break
+        except Exception as e:
+            logger.error(f"error while loading {self.path}: {e!r}")
+
+    async def waitForBackgroundLoading(self) -> None:
+        """Wait until the glyph data has been loaded in the background, see
+        `backgroundLoading`.
+        """
+        if self.backgroundLoading:
+            # The font may have been opened outside of an event loop
+            self._startBackgroundLoading()
+        if self._backgroundLoadingTask is not None:
+            await self._backgroundLoadingTask
 
     def _setupWithRawData(self, rawFontData, rawGlyphsData) -> None:
         gsFont = glyphsLib.classes.GSFont()
@@ -158,7 +365,7 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         self.masterIDByLocationTuple = {}
         for master in self.gsFont.masters:
             location = {}
-            for axisDef in get_axis_definitions(self.gsFont):
+            for axisDef in glyphsLib.builder.axes.get_axis_definitions(self.gsFont):
                 if axisDef.name in self.axisNames:
                     location[axisDef.name] = axisDef.get_design_loc(master)
             self.locationByMasterID[master.id] = location
@@ -187,32 +394,156 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         }
         self._cachedFeatures: OpenTypeFeatures | None = None
         self._cachedGlyphClassifications: tuple[set[str], set[str]] | None = None
+        self._cachedKerning: dict[str, Kerning] | None = None
+        self.glyphCache = (
+            VariableGlyphCache(self.glyphCacheMaxBytes)
+            if self.glyphCacheMaxBytes is not None
+            else None
+        )
 
     def _updateRawGlyphsData(self, rawGlyphsData) -> None:
         # Fill the glyphs list with dummy placeholder glyphs
         self.gsFont.glyphs = [
             glyphsLib.classes.GSGlyph() for i in range(len(rawGlyphsData))
         ]
+        # The index of a glyph in self.rawGlyphsData and self.gsFont.glyphs doesn't
+        # change while the glyph exists: new glyphs are appended, and deleted
+        # glyphs leave an empty (None) slot behind. The order in the file is
+        # given by _getGlyphIndicesInFileOrder().
         self.rawGlyphsData = rawGlyphsData
         self._updateGlyphNameToIndex()
         self.originalGlyphNameToIndex = dict(self.glyphNameToIndex)
-        self.parsedGlyphNames: set[str] = set()
-        self.glyphMap, self.glyphInfos, self.kerningGroups = self._readGlyphInfos()
-
-    def _loadFiles(self) -> tuple[dict[str, Any], list[Any]]:
-        rawFontData = openstepPlistFromPath(self.path)
+        self._numDeletedGlyphs = 0
+        self._glyphIndicesInFileOrder: list[int] | None = None
+        # Parsed glyph names, in least recently used order, with the names of
+        # their component glyphs
+        self.parsedGlyphs: dict[str, list[str]] = {}
+        self._componentIndex: ComponentIndex | None = None
+        glyphMap, glyphInfos, self.kerningGroups = self._readGlyphInfosCached()
+        # Keep the current snapshots if the glyph map or infos didn't change
+        if glyphMap != self.glyphMap:
+            self.glyphMap = glyphMap
+            self._glyphMapChanged()
+        if glyphInfos != self.glyphInfos:
+            self.glyphInfos = glyphInfos
+            self._glyphInfosChanged()
+        self.kerningGroupsByGlyph = getKerningGroupsByGlyph(self.kerningGroups)
+        self._cachedKerning = None
+        # We don't know whether the file on disk is formatted the way we write it,
+        # so the first write will be a full write
+        self._spliceWriter = None
+
+    def _loadFiles(self) -> tuple[dict[str, Any], list[Any], dict[str, str]]:
+        # Return the raw font data, the raw glyph data and the glyph digests
+        if self._scansGlyphHeaders:
+            return self._scanFiles()
+
+        self._parseCache = self._openParseCache()
+        if self._parseCache is not None:
+            # Don't modify the cached object, it gets saved after loading
+            rawFontData = dict(self._parseCache.openstepPlistFromPath(self.path))
+        else:
+            rawFontData = openstepPlistFromPath(self.path)
 
         # We separate the "glyphs" list from the rest, so we can prevent glyphsLib
         # from eagerly parsing all glyphs
         rawGlyphsData = rawFontData["glyphs"]
         rawFontData["glyphs"] = []
-        return rawFontData, rawGlyphsData
+        # The glyph records aren't known without scanning the file again, so the
+        # digests are made from the glyph data when they are needed
+        return rawFontData, rawGlyphsData, {}
+
+    def _openParseCache(self) -> ParseCache | None:
+        if self.parseCacheDir is None:
+            return None
+        return ParseCache(self.parseCacheDir, self.path)
+
+    def _saveParseCache(self) -> None:
+        if self._parseCache is not None:
+            self._parseCache.save()
+            self._parseCache = None
+
+    def _scanFiles(self) -> tuple[dict[str, Any], list[Any], dict[str, str]]:
+        data = self.path.read_bytes()
+        fontData, glyphRecords = scanGlyphsFile(data)
+
+        rawFontData = openstep_plist.loads(fontData.decode("utf-8"), use_numbers=True)
+        rawGlyphsData = [
+            UnparsedGlyphData(header, data[start:end])
+            for start, end, header in glyphRecords
+        ]
+        glyphDigests = {
+            glyphData["glyphname"]: glyphTextDigest(glyphData.text)
+            for glyphData in rawGlyphsData
+        }
+        return rawFontData, rawGlyphsData, glyphDigests
+
+    def _getRawGlyphData(self, glyphIndex: int) -> dict[str, Any]:
+        # Return the full raw glyph data, parsing it first if it was loaded lazily
+        glyphData = self.rawGlyphsData[glyphIndex]
+        if isinstance(glyphData, UnparsedGlyphData):
+            with self._parseLock:
+                glyphData = self.rawGlyphsData[glyphIndex]
+                if isinstance(glyphData, UnparsedGlyphData):
+                    glyphData = glyphData.parse()
+                    self.rawGlyphsData[glyphIndex] = glyphData
+        return glyphData
 
     def _updateGlyphNameToIndex(self):
         self.glyphNameToIndex = {
-            glyphData["glyphname"]: i for i, glyphData in enumerate(self.rawGlyphsData)
+            glyphData["glyphname"]: i
+            for i, glyphData in enumerate(self.rawGlyphsData)
+            if glyphData is not None
         }
 
+    def _getGlyphIndicesInFileOrder(self) -> list[int]:
+        # The glyphs that were in the file keep their position, new glyphs follow
+        # in the order in which they were added
+        if self._glyphIndicesInFileOrder is None:
+            originalGlyphNameToIndex = self.originalGlyphNameToIndex
+            self._glyphIndicesInFileOrder = [
+                glyphIndex
+                for _, glyphIndex in sorted(
+                    (originalGlyphNameToIndex.get(glyphName, 0xFFFFFFFF), glyphIndex)
+                    for glyphName, glyphIndex in self.glyphNameToIndex.items()
+                )
+            ]
+        return self._glyphIndicesInFileOrder
+
+    def _getRawGlyphsDataInFileOrder(self) -> list[Any]:
+        return [
+            self.rawGlyphsData[glyphIndex]
+            for glyphIndex in self._getGlyphIndicesInFileOrder()
+        ]
+
+    def _appendGlyphSlot(self, glyphName, rawGlyphData) -> None:
+        self.glyphNameToIndex[glyphName] = len(self.rawGlyphsData)
+        self.rawGlyphsData.append(rawGlyphData)
+        self.gsFont.glyphs.append(glyphsLib.classes.GSGlyph())
+        self._glyphIndicesInFileOrder = None
+
+    def _removeGlyphSlot(self, glyphName) -> None:
+        index = self.glyphNameToIndex.pop(glyphName)
+        assert self.rawGlyphsData[index]["glyphname"] == glyphName
+        self.rawGlyphsData[index] = None
+        self.gsFont.glyphs[index] = glyphsLib.classes.GSGlyph()
+        self._numDeletedGlyphs += 1
+        self._glyphIndicesInFileOrder = None
+        if self._numDeletedGlyphs > len(self.rawGlyphsData) // 2:
+            self._compactGlyphSlots()
+
+    def _compactGlyphSlots(self) -> None:
+        # Remove the empty slots of deleted glyphs. This changes glyph indices.
+        glyphIndices = sorted(self.glyphNameToIndex.values())
+        gsGlyphs = self.gsFont.glyphs
+        self.gsFont.glyphs = [gsGlyphs[glyphIndex] for glyphIndex in glyphIndices]
+        self.rawGlyphsData = [
+            self.rawGlyphsData[glyphIndex] for glyphIndex in glyphIndices
+        ]
+        self._updateGlyphNameToIndex()
+        self._numDeletedGlyphs = 0
+        self._glyphIndicesInFileOrder = None
+
     @property
     def _kerningSideAttrs(self):
         return (
@@ -225,92 +556,157 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         self,
     ) -> tuple[dict[str, list[int]], dict[str, Any], dict[str, dict[str, list[str]]]]:
         glyphMap = {}
-        glyphInfos: dict[str, Any] = defaultdict(dict)
+        glyphInfos: dict[str, Any] = {}
         kerningGroups: dict = defaultdict(lambda: defaultdict(list))
 
         for glyphData in self.rawGlyphsData:
             glyphName = glyphData["glyphname"]
-
-            # extract code points
-            codePoints = glyphData.get("unicode")
-            if codePoints is None:
-                codePoints = []
-            elif self.gsFont.format_version == 2:
-                if isinstance(codePoints, str):
-                    codePoints = [
-                        int(codePoint, 16) for codePoint in codePoints.split(",")
-                    ]
-                else:
-                    assert isinstance(codePoints, int)
-                    # The plist parser turned it into an int, but it was a hex string
-                    codePoints = [int(str(codePoints), 16)]
-            elif isinstance(codePoints, int):
-                codePoints = [codePoints]
-            else:
-                assert all(isinstance(codePoint, int) for codePoint in codePoints)
+            codePoints, glyphInfo, groupsBySide = self._readGlyphInfo(glyphData)
             glyphMap[glyphName] = codePoints
-
-            # extract infos
-            for gFieldName, fFieldname in [
-                ("category", "category"),
-                ("subCategory", "subcategory"),
-            ]:
-                fieldValue = glyphData.get(gFieldName)
-                if fieldValue:
-                    glyphInfos[glyphName][fFieldname] = fieldValue
-
-            # extract kern groups
-            for pairSide, glyphSideAttr in self._kerningSideAttrs:
-                groupName = glyphData.get(glyphSideAttr)
-                if groupName is not None:
-                    kerningGroups[pairSide][groupName].append(glyphName)
-
-        return glyphMap, dict(glyphInfos), kerningGroups
+            if glyphInfo:
+                glyphInfos[glyphName] = glyphInfo
+            for pairSide, groupName in groupsBySide.items():
+                kerningGroups[pairSide][groupName].append(glyphName)
+
+        return glyphMap, glyphInfos, kerningGroups
+
+    def _readGlyphInfo(
+        self, glyphData
+    ) -> tuple[list[int], dict[str, Any], dict[str, str]]:
+        # Return the code points, the infos and the kerning groups by pair side of
+        # a single glyph
+        # extract code points
+        codePoints = glyphData.get("unicode")
+        if codePoints is None:
+            codePoints = []
+        elif self.gsFont.format_version == 2:
+            if isinstance(codePoints, str):
+                codePoints = [int(codePoint, 16) for codePoint in codePoints.split(",")]
+            else:
+                assert isinstance(codePoints, int)
+                # The plist parser turned it into an int, but it was a hex string
+                codePoints = [int(str(codePoints), 16)]
+        elif isinstance(codePoints, int):
+            codePoints = [codePoints]
+        else:
+            assert all(isinstance(codePoint, int) for codePoint in codePoints)
+            codePoints = list(codePoints)
+
+        # extract infos
+        glyphInfo = {}
+        for gFieldName, fFieldname in [
+            ("category", "category"),
+            ("subCategory", "subcategory"),
+        ]:
+            fieldValue = glyphData.get(gFieldName)
+            if fieldValue:
+                glyphInfo[fFieldname] = fieldValue
+
+        # extract kern groups
+        groupsBySide = {}
+        for pairSide, glyphSideAttr in self._kerningSideAttrs:
+            groupName = glyphData.get(glyphSideAttr)
+            if groupName is not None:
+                groupsBySide[pairSide] = groupName
+
+        return codePoints, glyphInfo, groupsBySide
+
+    def _readGlyphInfosCached(self):
+        if self._parseCache is None:
+            return self._readGlyphInfos()
+
+        cachedGlyphInfos = self._parseCache.getDerivedData("glyphInfos")
+        if cachedGlyphInfos is not None:
+            glyphMap, glyphInfos, groupsBySide = cachedGlyphInfos
+            kerningGroups: dict = defaultdict(lambda: defaultdict(list))
+            for pairSide, groups in groupsBySide.items():
+                kerningGroups[pairSide].update(groups)
+            return glyphMap, glyphInfos, kerningGroups
+
+        glyphMap, glyphInfos, kerningGroups = self._readGlyphInfos()
+        # The nested defaultdicts can't be pickled
+        groupsBySide = {
+            pairSide: dict(groups) for pairSide, groups in kerningGroups.items()
+        }
+        self._parseCache.setDerivedData(
+            "glyphInfos", (glyphMap, glyphInfos, groupsBySide)
+        )
+        return glyphMap, glyphInfos, kerningGroups
 
     def _updateKerningGroups(self):
+        # Update the glyph data for the glyphs whose group membership changed
         changedGlyphs = set()
+        kerningGroupsByGlyph = getKerningGroupsByGlyph(self.kerningGroups)
 
-        for glyphData in self.rawGlyphsData:
-            glyphName = glyphData["glyphname"]
-
-            for pairSide, glyphSideAttr in self._kerningSideAttrs:
-                groups = self.kerningGroups.get(pairSide)
-                currentGroupName = glyphData.get(glyphSideAttr)
-                newGroupName = None
-                for groupName, group in groups.items():
-                    if glyphName in group:
-                        newGroupName = groupName
-                        break
-                if currentGroupName != newGroupName:
+        for pairSide, glyphSideAttr in self._kerningSideAttrs:
+            currentGroups = self.kerningGroupsByGlyph.get(pairSide, {})
+            newGroups = kerningGroupsByGlyph.get(pairSide, {})
+
+            for glyphName in currentGroups.keys() | newGroups.keys():
+                newGroupName = newGroups.get(glyphName)
+                if currentGroups.get(glyphName) == newGroupName:
+                    continue
+                if self._setGlyphKerningGroup(glyphName, glyphSideAttr, newGroupName):
                     changedGlyphs.add(glyphName)
-                    self.parsedGlyphNames.discard(glyphName)
-                    if newGroupName:
-                        glyphData[glyphSideAttr] = newGroupName
-                    else:
-                        glyphData.pop(glyphSideAttr, None)
 
+        self.kerningGroupsByGlyph = kerningGroupsByGlyph
         return changedGlyphs
 
+    def _setGlyphKerningGroup(self, glyphName, glyphSideAttr, groupName) -> bool:
+        # Return False if the glyph doesn't exist
+        glyphIndex = self.glyphNameToIndex.get(glyphName)
+        if glyphIndex is None:
+            return False
+        self.parsedGlyphs.pop(glyphName, None)
+        self._discardCachedGlyph(glyphName)
+        glyphData = self._getRawGlyphData(glyphIndex)
+        if groupName:
+            glyphData[glyphSideAttr] = groupName
+        else:
+            glyphData.pop(glyphSideAttr, None)
+        return True
+
     async def getGlyphMap(self) -> dict[str, list[int]]:
-        return deepcopy(self.glyphMap)
+        # The caller may change the dict, but the code point lists are shared
+        # with the snapshot: they are replaced when changed, never modified
+        return dict(self.getGlyphMapSnapshot().data)
+
+    def getGlyphMapSnapshot(self) -> GlyphDataSnapshot:
+        """Return a read-only snapshot of the glyph map. The same snapshot is
+        returned until the glyph map changes.
+        """
+        if self._glyphMapSnapshot is None:
+            self._glyphMapSnapshot = GlyphDataSnapshot(
+                self.glyphMapVersion, MappingProxyType(dict(self.glyphMap))
+            )
+        return self._glyphMapSnapshot
+
+    def _glyphMapChanged(self) -> None:
+        self.glyphMapVersion += 1
+        self._glyphMapSnapshot = None
 
     async def putGlyphMap(self, value: dict[str, list[int]]) -> None:
         pass
 
     async def deleteGlyph(self, glyphName: str) -> None:
-        if glyphName not in self.glyphNameToIndex:
-            logger.debug(f"Can't delete unknown glyph '{glyphName}'")
-            return
-
-        del self.glyphMap[glyphName]
-        index = self.glyphNameToIndex[glyphName]
-        assert self.rawGlyphsData[index]["glyphname"] == glyphName
-        del self.rawGlyphsData[index]
-        del self.gsFont.glyphs[index]
-        self.parsedGlyphNames.discard(glyphName)
-        self._updateGlyphNameToIndex()
-        self._updateDeletedGlyph(glyphName)
-        self._cachedGlyphClassifications = None
+        async with self._lock.writing():
+            # Check this with the lock held, the glyph may just have been deleted
+            if glyphName not in self.glyphNameToIndex:
+                logger.debug(f"Can't delete unknown glyph '{glyphName}'")
+                return
+
+            del self.glyphMap[glyphName]
+            self._glyphMapChanged()
+            if self.glyphInfos.pop(glyphName, None) is not None:
+                self._glyphInfosChanged()
+            self._removeGlyphSlot(glyphName)
+            self.parsedGlyphs.pop(glyphName, None)
+            self._discardCachedGlyph(glyphName)
+            self._updateComponentIndex(glyphName, None)
+            self._markGlyphDeleted(glyphName)
+            self._cachedGlyphClassifications = None
+            self._cachedKerning = None
+        self._scheduleFlush()
 
     async def getFontInfo(self) -> FontInfo:
         infoDict = {}
@@ -361,6 +757,21 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         return "vertKerning" if self.gsFont.format_version == 2 else "kerningVertical"
 
     async def getKerning(self) -> dict[str, Kerning]:
+        cachedKerning = self._cachedKerning
+        if cachedKerning is None:
+            # Don't read the kerning while it is being changed
+            async with self._lock.reading():
+                cachedKerning = self._cachedKerning
+                if cachedKerning is None:
+                    cachedKerning = self._cachedKerning = await self._getKerning()
+        # The caller may modify the result, but a structured copy is a lot
+        # cheaper than a deepcopy
+        return {
+            kernType: copyKerning(kerning)
+            for kernType, kerning in cachedKerning.items()
+        }
+
+    async def _getKerning(self) -> dict[str, Kerning]:
         kerningLTR = await self._gsKerningToFontraKerning("kerning", "left", "right")
         kerningRTL = kernutils.flipKerningDirection(
             await self._gsKerningToFontraKerning("kerningRTL", "right", "left")
@@ -387,9 +798,10 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         return kerning
 
     async def putKerning(self, kerning: dict[str, Kerning]) -> None:
-        async with self._writeLock:
+        async with self._lock.writing():
             ltrGlyphs, rtlGlyphs = await self._getGlyphClassifications()
-            return await runInThread(self._putKerning, kerning, ltrGlyphs, rtlGlyphs)
+            await runInThread(self._putKerning, kerning, ltrGlyphs, rtlGlyphs)
+        self._scheduleFlush()
 
     def _putKerning(
         self, kerning: dict[str, Kerning], ltrGlyph: set[str], rtlGlyphs: set[str]
@@ -420,7 +832,8 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         )
 
         changedGlyphs = self._updateKerningGroups()
-        self._writeFontData(changedGlyphs)
+        self._cachedKerning = None
+        self._markFontDataChanged(GS_KERNING_ATTRS, changedGlyphs)
 
     async def _gsKerningToFontraKerning(
         self, kerningAttr: str, side1: str, side2: str
@@ -522,6 +935,191 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         self.kerningGroups[side1] |= deepcopy(kerning.groupsSide1)
         self.kerningGroups[side2] |= deepcopy(kerning.groupsSide2)
 
+    async def updateKerning(
+        self,
+        kernType: str,
+        sourceIdentifiers: list[str],
+        values: dict[str, dict[str, list[float | None] | None]] | None = None,
+        groupsSide1: dict[str, list[str] | None] | None = None,
+        groupsSide2: dict[str, list[str] | None] | None = None,
+    ) -> None:
+        """Apply changes to the kerning of `kernType`, instead of replacing all
+        kerning like putKerning() does.
+
+        `values` maps pairs to their new values, in the order of
+        `sourceIdentifiers`. A value of None removes the pair for that source, None
+        instead of a list removes the pair for all sources. `groupsSide1` and
+        `groupsSide2` map group names to their new glyph names, or to None to
+        remove the group.
+        """
+        async with self._lock.writing():
+            ltrGlyphs, rtlGlyphs = await self._getGlyphClassifications()
+            await runInThread(
+                self._updateKerning,
+                kernType,
+                sourceIdentifiers,
+                values or {},
+                groupsSide1 or {},
+                groupsSide2 or {},
+                ltrGlyphs,
+                rtlGlyphs,
+            )
+        self._scheduleFlush()
+
+    def _updateKerning(
+        self,
+        kernType,
+        sourceIdentifiers,
+        values,
+        groupsSide1,
+        groupsSide2,
+        ltrGlyphs,
+        rtlGlyphs,
+    ) -> None:
+        if kernType not in {"kern", "vkrn"}:
+            raise GlyphsBackendError(
+                f"GlyphsApp Backend: '{kernType}' kern type not supported."
+            )
+
+        if kernType == "vkrn" and values and self._verticalKerningAttr == "vertKerning":
+            raise GlyphsBackendError(
+                "Writing vertical kerning is not supported for the Glyphs 2 format"
+            )
+
+        unknownSourceIdentifiers = set(sourceIdentifiers) - set(
+            gsMaster.id for gsMaster in self.gsFont.masters
+        )
+        if unknownSourceIdentifiers:
+            s = ", ".join(sorted(unknownSourceIdentifiers))
+            raise GlyphsBackendError(
+                f"Can't write kerning, found unknown source identifiers: {s}"
+            )
+
+        side1, side2 = ("left", "right") if kernType == "kern" else ("top", "bottom")
+        changedGlyphs = self._updateKerningGroupsPartially(side1, groupsSide1)
+        changedGlyphs |= self._updateKerningGroupsPartially(side2, groupsSide2)
+
+        pairs = [
+            (name1, name2, pairValues)
+            for name1, name2Dict in values.items()
+            for name2, pairValues in name2Dict.items()
+        ]
+
+        if kernType == "vkrn":
+            self._updateGSKerningValues(
+                self._verticalKerningAttr, "top", "bottom", pairs, sourceIdentifiers
+            )
+        elif pairs:
+            # Let kernutils decide whether a pair is LTR or RTL, the same way as
+            # for putKerning(). The pair indices are passed as values, so we can
+            # find the pairs back, in the orientation they are stored in.
+            indexKerning = Kerning(
+                groupsSide1=dict(self.kerningGroups["left"]),
+                groupsSide2=dict(self.kerningGroups["right"]),
+                sourceIdentifiers=["pairIndex"],
+                values={},
+            )
+            for pairIndex, (name1, name2, _) in enumerate(pairs):
+                indexKerning.values.setdefault(name1, {})[name2] = [pairIndex]
+
+            ltrKerning, rtlKerning = kernutils.splitKerningByDirection(
+                indexKerning, ltrGlyphs, rtlGlyphs
+            )
+            rtlKerning = kernutils.flipKerningDirection(rtlKerning)
+
+            for kerning, kerningAttr, gsSide1, gsSide2 in [
+                (ltrKerning, "kerning", "left", "right"),
+                (rtlKerning, "kerningRTL", "right", "left"),
+            ]:
+                directionPairs = [
+                    (name1, name2, pairs[pairIndex][2])
+                    for name1, name2Dict in kerning.values.items()
+                    for name2, (pairIndex,) in name2Dict.items()
+                ]
+                self._updateGSKerningValues(
+                    kerningAttr, gsSide1, gsSide2, directionPairs, sourceIdentifiers
+                )
+
+        self._cachedKerning = None
+        self._markFontDataChanged(GS_KERNING_ATTRS, changedGlyphs)
+
+    def _updateKerningGroupsPartially(self, pairSide, groupChanges) -> set[str]:
+        # Apply group changes, and update the glyphs whose membership changed.
+        # A glyph that is in more than one group for a side is not supported.
+        if not groupChanges:
+            return set()
+
+        groups = self.kerningGroups[pairSide]
+        groupsByGlyph = self.kerningGroupsByGlyph.setdefault(pairSide, {})
+        glyphSideAttr = dict(self._kerningSideAttrs)[pairSide]
+
+        newGroupsByGlyph = {}
+        for groupName, glyphNames in groupChanges.items():
+            for glyphName in groups.get(groupName, ()):
+                newGroupsByGlyph.setdefault(glyphName, None)
+            if glyphNames is None:
+                groups.pop(groupName, None)
+            else:
+                groups[groupName] = list(glyphNames)
+                for glyphName in glyphNames:
+                    newGroupsByGlyph[glyphName] = groupName
+
+        changedGlyphs = set()
+        for glyphName, groupName in newGroupsByGlyph.items():
+            currentGroupName = groupsByGlyph.get(glyphName)
+            if groupName is None and currentGroupName not in groupChanges:
+                # The glyph was removed from a group it wasn't in
+                continue
+            if currentGroupName == groupName:
+                continue
+            if currentGroupName is not None and currentGroupName not in groupChanges:
+                # The glyph moved from an unchanged group: remove it from there
+                groups[currentGroupName] = [
+                    gn for gn in groups[currentGroupName] if gn != glyphName
+                ]
+            if groupName is None:
+                del groupsByGlyph[glyphName]
+            else:
+                groupsByGlyph[glyphName] = groupName
+            if self._setGlyphKerningGroup(glyphName, glyphSideAttr, groupName):
+                changedGlyphs.add(glyphName)
+
+        return changedGlyphs
+
+    def _updateGSKerningValues(
+        self, kerningAttr, side1, side2, pairs, sourceIdentifiers
+    ) -> None:
+        gsKerning = getattr(self.gsFont, kerningAttr, None)
+        if gsKerning is None:
+            gsKerning = OrderedDict()
+            setattr(self.gsFont, kerningAttr, gsKerning)
+
+        gsPrefix1 = GS_KERN_GROUP_PREFIXES[side1]
+        gsPrefix2 = GS_KERN_GROUP_PREFIXES[side2]
+        masterIDs = [gsMaster.id for gsMaster in self.gsFont.masters]
+
+        for name1, name2, pairValues in pairs:
+            if name1.startswith("@"):
+                name1 = gsPrefix1 + name1[1:]
+            if name2.startswith("@"):
+                name2 = gsPrefix2 + name2[1:]
+
+            if pairValues is None:
+                valuesBySource = dict.fromkeys(masterIDs)
+            else:
+                valuesBySource = dict(zip(sourceIdentifiers, pairValues))
+
+            for sourceIdentifier, value in valuesBySource.items():
+                kernDict = gsKerning.get(sourceIdentifier)
+                if value is not None:
+                    if kernDict is None:
+                        kernDict = gsKerning[sourceIdentifier] = {}
+                    kernDict.setdefault(name1, {})[name2] = value
+                elif kernDict is not None and name2 in kernDict.get(name1, ()):
+                    del kernDict[name1][name2]
+                    if not kernDict[name1]:
+                        del kernDict[name1]
+
     async def _getGlyphClassifications(self) -> tuple[set[str], set[str]]:
         if self._cachedGlyphClassifications is None:
             features = await self.getFeatures()
@@ -557,8 +1155,9 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
 
     async def putFeatures(self, features: OpenTypeFeatures) -> None:
         self._cachedFeatures = deepcopy(features)
-        async with self._writeLock:
-            return await runInThread(self._putFeatures, features)
+        async with self._lock.writing():
+            await runInThread(self._putFeatures, features)
+        self._scheduleFlush()
 
     def _putFeatures(self, features: OpenTypeFeatures) -> None:
         if features.language != "fea":
@@ -580,24 +1179,56 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
             glyphsLib.builder.features._to_glyphs_features(
                 self.gsFont, features.text, glyph_names=self.glyphNameToIndex.keys()
             )
-        except FeatureLibError:
+        except feaLibError.FeatureLibError:
             self.gsFont.userData[invalidFeaturesUserDataKey] = features.text
         else:
             if invalidFeaturesUserDataKey in self.gsFont.userData:
                 del self.gsFont.userData[invalidFeaturesUserDataKey]
 
-        self._writeFontData()
+        self._markFontDataChanged(GS_FEATURES_ATTRS)
         self._cachedGlyphClassifications = None
-
-    def _writeFontData(self, changedGlyphs=None):
-        # Set self.gsFont.glyphs to an empty list temporarily, so no time is wasted on these.
-        originalGlyphs = list(self.gsFont.glyphs.values())
-        self.gsFont.glyphs = []
-        try:
-            self.rawFontData = self._getRawData(self.gsFont)
-            self._writeRawFontData(changedGlyphs)
-        finally:
-            self.gsFont.glyphs = originalGlyphs
+        self._cachedKerning = None
+
+    def _updateRawFontData(self, fontAttrs, rawFontData=None):
+        # Only update the raw font data for the GSFont attributes that changed, the
+        # way GSFont._serialize_to_plist() writes them, instead of writing the
+        # whole GSFont with glyphsLib and parsing it again.
+        if rawFontData is None:
+            rawFontData = self.rawFontData
+        gsFont = self.gsFont
+        rawKerningKeys = GS_KERNING_RAW_KEYS[gsFont.format_version]
+
+        for attrName in sorted(fontAttrs):
+            if attrName in rawKerningKeys:
+                rawKey, writeIfEmpty = rawKerningKeys[attrName]
+                gsKerning = getattr(gsFont, attrName)
+                rawValue = (
+                    gsValueToRawValue(gsKerning)
+                    if gsKerning or (writeIfEmpty and gsKerning is not None)
+                    else None
+                )
+                setRawFontDataValue(rawFontData, rawKey, rawValue)
+            elif attrName in GS_KERNING_ATTRS:
+                # Not written for this format version
+                pass
+            elif attrName == "userData":
+                # The features only change our own key
+                userData = dict(rawFontData.get("userData", {}))
+                userData.pop(invalidFeaturesUserDataKey, None)
+                if invalidFeaturesUserDataKey in gsFont.userData:
+                    userData[invalidFeaturesUserDataKey] = gsFont.userData[
+                        invalidFeaturesUserDataKey
+                    ]
+                setRawFontDataValue(
+                    rawFontData,
+                    "userData",
+                    {key: userData[key] for key in sorted(userData)} or None,
+                )
+            else:
+                rawItems = [
+                    self._getRawData(item) for item in getattr(gsFont, attrName)
+                ]
+                setRawFontDataValue(rawFontData, attrName, rawItems or None)
 
     async def getBackgroundImage(self, imageIdentifier: str) -> ImageData | None:
         return None
@@ -616,16 +1247,197 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         )
 
     async def getGlyphInfos(self) -> dict[str, Any]:
-        return deepcopy(self.glyphInfos)
+        # Like getGlyphMap(), the info dicts are shared with the snapshot
+        return dict(self.getGlyphInfosSnapshot().data)
+
+    def getGlyphInfosSnapshot(self) -> GlyphDataSnapshot:
+        """Return a read-only snapshot of the glyph infos. The same snapshot is
+        returned until the glyph infos change.
+        """
+        if self._glyphInfosSnapshot is None:
+            self._glyphInfosSnapshot = GlyphDataSnapshot(
+                self.glyphInfosVersion, MappingProxyType(dict(self.glyphInfos))
+            )
+        return self._glyphInfosSnapshot
+
+    def _glyphInfosChanged(self) -> None:
+        self.glyphInfosVersion += 1
+        self._glyphInfosSnapshot = None
+
+    def getGlyphDigest(self, glyphName: str) -> str | None:
+        """Return a digest of the glyph's record as it is written to the file, or
+        None if the glyph doesn't exist. The digest changes when the glyph data
+        changes, but also when the record is formatted differently.
+        """
+        glyphIndex = self.glyphNameToIndex.get(glyphName)
+        if glyphIndex is None:
+            return None
+        digest = self.glyphDigests.get(glyphName)
+        if digest is None:
+            # The glyph has changes that weren't written yet, or the file
+            # couldn't be scanned for its glyph records
+            glyphData = self.rawGlyphsData[glyphIndex]
+            digest = self.glyphDigests[glyphName] = glyphTextDigest(
+                glyphData.text
+                if isinstance(glyphData, UnparsedGlyphData)
+                else self._dumpsRawGlyph(glyphIndex)
+            )
+        return digest
 
     async def getGlyph(self, glyphName: str) -> VariableGlyph | None:
-        if glyphName not in self.glyphNameToIndex:
-            return None
+        async with self._lock.reading():
+            glyphIndex = self.glyphNameToIndex.get(glyphName)
+            if glyphIndex is None:
+                return None
+
+            return await self._runReader(self._getGlyphCached, glyphName, glyphIndex)
+
+    async def _runReader(self, func, *args):
+        # Run a read function in the bounded pool of reader threads, so reads
+        # don't block the event loop
+        if self._readExecutor is None:
+            self._readExecutor = ThreadPoolExecutor(
+                self.glyphReadWorkers, thread_name_prefix="fontra-glyphs-reader"
+            )
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._readExecutor, func, *args)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The thread can't be stopped. Wait for it to finish, so the caller
+            # doesn't leave its reading() block while the data is still read.
+            while not future.done():
+                try:
+                    await asyncio.wait([future])
+                except asyncio.CancelledError:
+                    pass
+            raise
+
+    async def getGlyphs(
+        self, glyphNames: Iterable[str]
+    ) -> AsyncIterator[tuple[str, VariableGlyph | None]]:
+        """Yield a (glyphName, glyph) tuple for each of `glyphNames`, as soon as
+        the glyph is converted. The glyph is None for unknown glyph names.
+
+        The lazily loaded glyph data of the glyphs and their nested components is
+        parsed up front, in parallel if `glyphBatchWorkers` is set. The glyphs
+        are converted in worker threads, `glyphBatchSize` glyphs at a time, so
+        the event loop isn't blocked.
+        """
+        glyphNamesToConvert = []
+        for glyphName in dict.fromkeys(glyphNames):
+            if glyphName in self.glyphNameToIndex:
+                glyphNamesToConvert.append(glyphName)
+            else:
+                yield glyphName, None
 
-        self._ensureGlyphIsParsed(glyphName)
+        if not glyphNamesToConvert:
+            return
+
+        async with self._lock.reading():
+            await self._runReader(self._parseGlyphClosure, glyphNamesToConvert)
+
+        for i in range(0, len(glyphNamesToConvert), self.glyphBatchSize):
+            chunk = glyphNamesToConvert[i : i + self.glyphBatchSize]
+            # The glyphs may have been changed or deleted in the meantime
+            async with self._lock.reading():
+                glyphs = await self._runReader(self._getGlyphsChunk, chunk)
+            for glyphName, glyph in zip(chunk, glyphs):
+                yield glyphName, glyph
+
+    def _getGlyphsChunk(self, glyphNames) -> list[VariableGlyph | None]:
+        glyphs = []
+        for glyphName in glyphNames:
+            glyphIndex = self.glyphNameToIndex.get(glyphName)
+            glyphs.append(
+                None
+                if glyphIndex is None
+                else self._getGlyphCached(glyphName, glyphIndex)
+            )
+        return glyphs
+
+    def _parseGlyphClosure(self, glyphNames) -> None:
+        # Parse the lazily loaded glyph data of the glyphs and of their nested
+        # components, one level of component nesting at a time
+        componentIndex = ComponentIndex(self.gsFont.format_version)
+        seenGlyphNames = set(glyphNames)
+        glyphIndices = [
+            self.glyphNameToIndex[glyphName]
+            for glyphName in glyphNames
+            if glyphName in self.glyphNameToIndex
+        ]
 
-        gsGlyph = self.gsFont.glyphs[glyphName]
-        assert gsGlyph is not None, glyphName
+        while glyphIndices:
+            self._parseRawGlyphsData(glyphIndices)
+            nextGlyphIndices = []
+            for glyphIndex in glyphIndices:
+                baseGlyphNames = componentIndex.getBaseGlyphNames(
+                    self.rawGlyphsData[glyphIndex]
+                )
+                for baseGlyphName in sorted(baseGlyphNames - seenGlyphNames):
+                    seenGlyphNames.add(baseGlyphName)
+                    baseGlyphIndex = self.glyphNameToIndex.get(baseGlyphName)
+                    if baseGlyphIndex is not None:
+                        nextGlyphIndices.append(baseGlyphIndex)
+            glyphIndices = nextGlyphIndices
+
+    def _parseRawGlyphsData(self, glyphIndices) -> None:
+        unparsedIndices = [
+            glyphIndex
+            for glyphIndex in glyphIndices
+            if isinstance(self.rawGlyphsData[glyphIndex], UnparsedGlyphData)
+        ]
+        if self.glyphBatchWorkers and len(unparsedIndices) > parallelLoadingChunkSize:
+            # Starting the worker processes only pays off for many glyphs
+            texts = [
+                self.rawGlyphsData[glyphIndex].text.decode("utf-8")
+                for glyphIndex in unparsedIndices
+            ]
+            parsedGlyphsData = openstepPlistsFromTextsParallel(
+                texts, self.glyphBatchWorkers
+            )
+            with self._parseLock:
+                for glyphIndex, glyphData in zip(unparsedIndices, parsedGlyphsData):
+                    if isinstance(self.rawGlyphsData[glyphIndex], UnparsedGlyphData):
+                        self.rawGlyphsData[glyphIndex] = glyphData
+        else:
+            for glyphIndex in unparsedIndices:
+                self._getRawGlyphData(glyphIndex)
+
+    def _getGlyphCached(self, glyphName: str, glyphIndex: int) -> VariableGlyph:
+        if self.glyphCache is None:
+            return self._getGlyph(glyphName, glyphIndex)
+
+        with self._parseLock:
+            glyph = self.glyphCache.get(glyphName)
+        if glyph is None:
+            glyph = self._getGlyph(glyphName, glyphIndex)
+            with self._parseLock:
+                self.glyphCache.put(glyphName, glyph)
+        # The caller may modify the result
+        return deepcopy(glyph)
+
+    def _discardCachedGlyph(self, glyphName: str) -> None:
+        if self.glyphCache is not None:
+            self.glyphCache.discard(glyphName)
+
+    def _getGlyph(self, glyphName: str, glyphIndex: int) -> VariableGlyph:
+        if self.gsFont.format_version == 3:
+            rawGlyphData = self._getRawGlyphData(glyphIndex)
+            rawLayers = self._getOrderedRawLayers(rawGlyphData)
+            if rawLayers is not None:
+                return self._rawGlyphToVariableGlyph(glyphName, rawGlyphData, rawLayers)
+
+        return self._gsGlyphToVariableGlyph(glyphName)
+
+    def _gsGlyphToVariableGlyph(self, glyphName: str) -> VariableGlyph:
+        # Other readers may evict the GSGlyph once the lock is released, but we
+        # keep the parsed object
+        with self._parseLock:
+            self._ensureGlyphIsParsed(glyphName)
+            # Looking up by name makes glyphsLib rebuild its name index
+            gsGlyph = self.gsFont.glyphs[self.glyphNameToIndex[glyphName]]
+        assert gsGlyph.name == glyphName, glyphName
 
         customData = {}
         if gsGlyph.color is not None:
@@ -723,13 +1535,149 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         )
         return glyph
 
+    def _getOrderedRawLayers(self, rawGlyphData):
+        # Return (masterId, rawLayer) tuples in the order in which glyphsLib's
+        # GSGlyph.layers would return the layers: master layers in master order,
+        # then the other layers. Return None if the glyph uses features that
+        # _rawGlyphToVariableGlyph() doesn't support: smart components, and
+        # brace and bracket layers.
+        if "partsSettings" in rawGlyphData:
+            return None
+
+        layersById = {}
+        for rawLayer in rawGlyphData.get("layers", ()):
+            if "attr" in rawLayer or "partSelection" in rawLayer:
+                return None
+            layerId = rawLayer.get("layerId")
+            masterId = rawLayer.get("associatedMasterId") or layerId
+            if not layerId or masterId not in self.locationByMasterID:
+                return None
+            layersById[layerId] = (masterId, rawLayer)
+
+        masterLayerIds = {
+            layerId
+            for layerId, (masterId, rawLayer) in layersById.items()
+            if layerId == masterId
+        }
+        return [
+            layersById[masterId]
+            for masterId in self.locationByMasterID
+            if masterId in masterLayerIds
+        ] + [
+            masterIdAndLayer
+            for layerId, masterIdAndLayer in layersById.items()
+            if layerId not in masterLayerIds
+        ]
+
+    def _rawGlyphToVariableGlyph(
+        self, glyphName: str, rawGlyphData, rawLayers
+    ) -> VariableGlyph:
+        # Equivalent to _gsGlyphToVariableGlyph() for glyphs without brace,
+        # bracket or smart layers, but converting the raw format 3 glyph data
+        # directly, without building GSGlyph objects
+        customData = {}
+        if rawGlyphData.get("color") is not None:
+            customData["com.glyphsapp.glyph-color"] = rawGlyphData["color"]
+
+        seenMasterIDs: dict[str, None] = {}
+        for masterId, rawLayer in rawLayers:
+            seenMasterIDs[masterId] = None
+
+        masterOrder = {masterID: i for i, masterID in enumerate(seenMasterIDs)}
+        rawLayers = sorted(rawLayers, key=lambda item: masterOrder[item[0]])
+
+        componentParser = glyphsLib.parser.Parser(
+            current_type=glyphsLib.classes.GSComponent, format_version=3
+        )
+        seenLocations = []
+        sources = []
+        layers = {}
+
+        for masterId, rawLayer in rawLayers:
+            layerId = rawLayer["layerId"]
+            userData = rawLayer.get("userData", {})
+            masterName = self.gsFont.masters[masterId].name
+            gsLayerName = masterName if layerId == masterId else rawLayer.get("name")
+            if "xyz.fontra.source-name" in userData:
+                sourceName = userData["xyz.fontra.source-name"]
+            else:
+                sourceName = gsLayerName or masterName
+            layerName = userData.get("xyz.fontra.layer-name") or layerId
+            layerWidth = rawLayer.get("width", 600)
+
+            location = self.locationByMasterID[masterId]
+
+            storeLayerId = True
+            if location in seenLocations:
+                bgLayerName = (
+                    gsLayerName if gsLayerName else "empty-background-layer-name"
+                )
+                layerName = f"{masterId}^{bgLayerName}"
+                bgSeparator = "/"
+            else:
+                storeLayerId = layerName != layerId
+                seenLocations.append(location)
+                sources.append(
+                    GlyphSource(
+                        name=sourceName if sourceName != masterName else "",
+                        location={},
+                        locationBase=masterId if self.defaultLocation else None,
+                        layerName=layerName,
+                    )
+                )
+                bgSeparator = "^"
+
+            layers[layerName] = rawLayerToFontraLayer(
+                rawLayer,
+                componentParser,
+                self.axisNames,
+                layerWidth,
+                layerId if storeLayerId else None,
+            )
+
+            if "background" in rawLayer:
+                layers[layerName + bgSeparator + "background"] = rawLayerToFontraLayer(
+                    rawLayer["background"],
+                    componentParser,
+                    self.axisNames,
+                    layerWidth,
+                    None,
+                )
+
+        return VariableGlyph(
+            name=glyphName, sources=sources, layers=layers, customData=customData
+        )
+
     def _ensureGlyphIsParsed(self, glyphName: str) -> None:
-        if glyphName in self.parsedGlyphNames:
+        usedGlyphNames: dict[str, None] = {}
+        self._ensureGlyphAndComponentsAreParsed(glyphName, usedGlyphNames)
+        self._evictParsedGlyphs(usedGlyphNames)
+
+    def _ensureGlyphAndComponentsAreParsed(self, glyphName, usedGlyphNames) -> None:
+        if glyphName in usedGlyphNames:
             return
+        usedGlyphNames[glyphName] = None
+
+        # Move the glyph to the end, as the most recently used one
+        componentNames = self.parsedGlyphs.pop(glyphName, None)
+        if componentNames is None:
+            self.parsedGlyphCounters["misses"] += 1
+            componentNames = self._parseGlyph(glyphName)
+        else:
+            self.parsedGlyphCounters["hits"] += 1
+        self.parsedGlyphs[glyphName] = componentNames
+
+        # Load all component dependencies. This is also needed if the glyph was
+        # parsed already, as its components may have been evicted or changed.
+        for compoName in componentNames:
+            if compoName not in self.glyphNameToIndex:
+                continue
+            self._ensureGlyphAndComponentsAreParsed(compoName, usedGlyphNames)
 
+    def _parseGlyph(self, glyphName: str) -> list[str]:
+        # Parse the glyph into the GSFont, return the names of its components
         glyphIndex = self.glyphNameToIndex[glyphName]
-        rawGlyphData = self.rawGlyphsData[glyphIndex]
-        self.parsedGlyphNames.add(glyphName)
+        rawGlyphData = self._getRawGlyphData(glyphIndex)
 
         gsGlyph = glyphsLib.classes.GSGlyph()
         p = glyphsLib.parser.Parser(
@@ -739,7 +1687,6 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         assert glyphIndex < len(self.gsFont.glyphs), len(self.gsFont.glyphs)
         self.gsFont.glyphs[glyphIndex] = gsGlyph
 
-        # Load all component dependencies
         componentNames = set()
         for layer in gsGlyph.layers:
             for component in layer.components:
@@ -748,10 +1695,22 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
                 for component in layer.background.components:
                     componentNames.add(component.name)
 
-        for compoName in sorted(componentNames):
-            if compoName not in self.glyphNameToIndex:
-                continue
-            self._ensureGlyphIsParsed(compoName)
+        return sorted(componentNames)
+
+    def _evictParsedGlyphs(self, usedGlyphNames) -> None:
+        # The glyphs that were just used, and their components, are never evicted:
+        # they are at the end of self.parsedGlyphs
+        if self.maxParsedGlyphs is None:
+            return
+
+        while len(self.parsedGlyphs) > self.maxParsedGlyphs:
+            glyphName = next(iter(self.parsedGlyphs))
+            if glyphName in usedGlyphNames:
+                break
+            del self.parsedGlyphs[glyphName]
+            glyphIndex = self.glyphNameToIndex[glyphName]
+            self.gsFont.glyphs[glyphIndex] = glyphsLib.classes.GSGlyph()
+            self.parsedGlyphCounters["evictions"] += 1
 
     def _getBraceLayerLocation(self, gsLayer):
         if not gsLayer._is_brace_layer():
@@ -766,7 +1725,7 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         location = {
             name: (
                 localAxesByName[name].minValue
-                if poleValue == Pole.MIN
+                if poleValue == smartComponents.Pole.MIN
                 else localAxesByName[name].maxValue
             )
             for name, poleValue in gsLayer.smartComponentPoleMapping.items()
@@ -790,8 +1749,25 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
     async def putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
     ) -> None:
-        async with self._writeLock:
-            return await runInThread(self._putGlyph, glyphName, glyph, codePoints)
+        async with self._lock.writing():
+            await runInThread(self._putGlyph, glyphName, glyph, codePoints)
+        self._scheduleFlush()
+
+    async def putGlyphs(
+        self, glyphs: dict[str, tuple[VariableGlyph, list[int]]]
+    ) -> None:
+        """Change or add many glyphs at once. `glyphs` maps glyph names to
+        (glyph, codePoints) tuples. The changes are written to disk once, after
+        all glyphs have been converted.
+        """
+        async with self._lock.writing():
+            await runInThread(self._putGlyphs, glyphs)
+        self._scheduleFlush()
+
+    def _putGlyphs(self, glyphs) -> None:
+        with self._deferringWrites():
+            for glyphName, (glyph, codePoints) in glyphs.items():
+                self._putGlyph(glyphName, glyph, codePoints)
 
     def _putGlyph(
         self, glyphName: str, glyph: VariableGlyph, codePoints: list[int]
@@ -800,56 +1776,179 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         assert all(isinstance(cp, int) for cp in codePoints)
         assert all(source.layerName in glyph.layers for source in glyph.sources)
 
+        # The glyph gets its slot once the conversion succeeded, so a failed
+        # conversion doesn't leave the font in an inconsistent state
+        isNewGlyph = glyphName not in self.glyphNameToIndex
+
+        rawGlyphData = self._variableGlyphToRawGlyph(
+            glyphName, glyph, codePoints, isNewGlyph
+        )
+        if rawGlyphData is None or self.checkRawGlyphWriter:
+            gsRawGlyphData = self._variableGlyphToRawGlyphWithGSGlyph(
+                glyphName, glyph, codePoints, isNewGlyph
+            )
+            self._updateKerningSidesForGlyph(gsRawGlyphData)
+            if rawGlyphData is not None:
+                self._updateKerningSidesForGlyph(rawGlyphData)
+                assert openstepPlistDumps(rawGlyphData) == openstepPlistDumps(
+                    gsRawGlyphData
+                ), glyphName
+            rawGlyphData = gsRawGlyphData
+        else:
+            self._updateKerningSidesForGlyph(rawGlyphData)
+
         if self.glyphMap.get(glyphName) != codePoints:
-            self.glyphMap[glyphName] = codePoints
+            self.glyphMap[glyphName] = list(codePoints)
+            self._glyphMapChanged()
             self._cachedGlyphClassifications = None
+            self._cachedKerning = None
+
+        self._updateComponentIndex(glyphName, rawGlyphData)
+
+        # Replace original "raw" object with new "raw" object
+        if isNewGlyph:
+            self._appendGlyphSlot(glyphName, rawGlyphData)
+        else:
+            self.rawGlyphsData[self.glyphNameToIndex[glyphName]] = rawGlyphData
+
+        self._markGlyphChanged(glyphName, isNewGlyph)
 
-        isNewGlyph = glyphName not in self.gsFont.glyphs
-        # Glyph does not exist: create new one.
+        # Remove glyph from parsed glyph names, because we changed it.
+        # Next time it needs to be parsed again.
+        self.parsedGlyphs.pop(glyphName, None)
+        self._discardCachedGlyph(glyphName)
+
+    def _variableGlyphToRawGlyphWithGSGlyph(
+        self, glyphName, variableGlyph, codePoints, isNewGlyph
+    ):
         if isNewGlyph:
             gsGlyph = glyphsLib.classes.GSGlyph(glyphName)
-            self.gsFont.glyphs.append(gsGlyph)
-            self.glyphNameToIndex[glyphName] = len(self.gsFont.glyphs) - 1
-
-        gsGlyph = deepcopy(self.gsFont.glyphs[glyphName])
+            # Like the glyphs in the font, without adding it to the font yet
+            gsGlyph.parent = self.gsFont
+        else:
+            # getGlyph() may not have needed the GSGlyph
+            self._ensureGlyphIsParsed(glyphName)
+            gsGlyph = deepcopy(self.gsFont.glyphs[self.glyphNameToIndex[glyphName]])
 
-        self._variableGlyphToGSGlyph(glyph, gsGlyph)
+        self._variableGlyphToGSGlyph(variableGlyph, gsGlyph)
 
         # Update unicodes: need to be converted from decimal to hex strings
         gsGlyph.unicodes = [f"{codePoint:04X}" for codePoint in codePoints]
 
-        rawGlyphData = self._getRawData(gsGlyph)
-        self._updateKerningSidesForGlyph(rawGlyphData)
+        return self._getRawData(gsGlyph)
+
+    def _variableGlyphToRawGlyph(
+        self, glyphName, variableGlyph, codePoints, isNewGlyph
+    ):
+        # Build the raw (format 3) glyph data directly, producing the same data as
+        # _variableGlyphToRawGlyphWithGSGlyph(), without the glyphsLib write/parse
+        # round trip. Return None for glyphs this doesn't support: smart glyphs,
+        # glyphs with brace layers, and glyphs with data we don't know how
+        # glyphsLib would write.
+        if self.gsFont.format_version != 3 or variableGlyph.axes:
+            return None
 
-        # Replace original "raw" object with new "raw" object
-        glyphIndex = self.glyphNameToIndex[glyphName]
         if isNewGlyph:
-            assert glyphIndex == len(self.rawGlyphsData)
-            self.rawGlyphsData.append(rawGlyphData)
-            self.rawGlyphsData.sort(
-                key=lambda glyphData: self.originalGlyphNameToIndex.get(
-                    glyphData["glyphname"], 0xFFFFFFFF
-                )
-            )
-            self._updateGlyphNameToIndex()
+            rawGlyphData = {"glyphname": glyphName}
+            rawLayersById = {}
         else:
-            self.rawGlyphsData[glyphIndex] = rawGlyphData
+            oldRawGlyphData = self._getRawGlyphData(self.glyphNameToIndex[glyphName])
+            if not canWriteRawGlyph(oldRawGlyphData):
+                return None
+            rawGlyphData = {
+                key: normalizeRawValue(value)
+                for key, value in oldRawGlyphData.items()
+                if isWrittenRawGlyphValue(key, value)
+            }
+            rawLayersById = {
+                rawLayer["layerId"]: copyRawLayer(rawLayer)
+                for rawLayer in oldRawGlyphData.get("layers", ())
+            }
 
-        self._writeRawGlyph(glyphName, isNewGlyph)
+        sourceLayers = getCheckedSourceLayers(variableGlyph)
 
-        # Remove glyph from parsed glyph names, because we changed it.
-        # Next time it needs to be parsed again.
-        self.parsedGlyphNames.discard(glyphName)
+        layerIdsInUse = set()
+        backgroundLayerIds = set()
 
-    def _variableGlyphToGSGlyph(self, variableGlyph, gsGlyph):
-        sourceLayers, sourceLayerNames = getSourceLayerNames(variableGlyph)
-        nonSourceLayerNames = set(variableGlyph.layers) - sourceLayerNames
+        for glyphSource in variableGlyph.sources:
+            sourceInfo = self._setupSourceInfo(
+                glyphSource, sourceLayers, variableGlyph, {}
+            )
+            if sourceInfo.isBraceLayer:
+                return None
 
-        if nonSourceLayerNames:
-            raise GlyphsBackendError(
-                "GlyphsApp Backend: Layer without glyph source is not supported."
+            sourceLayerNames = [glyphSource.layerName] + sorted(
+                sourceLayers[glyphSource.layerName]
             )
 
+            for layerName in sourceLayerNames:
+                layerInfo = setupLayerInfo(
+                    glyphSource, sourceInfo, layerName, variableGlyph, None, set()
+                )
+
+                rawLayer = rawLayersById.setdefault(
+                    layerInfo.gsLayerId, {"layerId": layerInfo.gsLayerId}
+                )
+                layerIdsInUse.add(layerInfo.gsLayerId)
+                if layerInfo.isBackgroundLayer:
+                    backgroundLayerIds.add(layerInfo.gsLayerId)
+
+                targetLayer = updateRawLayer(
+                    layerName, glyphSource, rawLayer, sourceInfo, layerInfo
+                )
+
+                self._fontraLayerToRawLayer(
+                    variableGlyph.layers[layerName],
+                    targetLayer,
+                    layerInfo.isBackgroundLayer,
+                )
+
+        rawLayers = [
+            rawLayer
+            for layerId, rawLayer in rawLayersById.items()
+            if layerId in layerIdsInUse
+        ]
+        if any(
+            "background" in rawLayer and rawLayer["layerId"] not in backgroundLayerIds
+            for rawLayer in rawLayers
+        ):
+            # glyphsLib keeps a background layer that is missing from the
+            # VariableGlyph, we didn't copy it
+            return None
+        if rawLayers:
+            rawGlyphData["layers"] = [
+                sortRawLayerKeys(rawLayer, False) for rawLayer in rawLayers
+            ]
+
+        rawGlyphData.pop("unicode", None)
+        if len(codePoints) == 1:
+            rawGlyphData["unicode"] = codePoints[0]
+        elif codePoints:
+            rawGlyphData["unicode"] = list(codePoints)
+
+        return rawGlyphData
+
+    def _fontraLayerToRawLayer(self, layer, rawLayer, isBackgroundLayer):
+        # Equivalent to fontraLayerToGSLayer()
+        pen = RawPathPointPen()
+        layer.glyph.path.drawPoints(pen)
+
+        rawLayer["shapes"] = pen.rawPaths + [
+            self._getRawData(fontraComponentToGSComponent(component))
+            for component in layer.glyph.components
+        ]
+        rawLayer["anchors"] = [
+            fontraAnchorToRawAnchor(anchor) for anchor in layer.glyph.anchors
+        ]
+        rawLayer["guides"] = [
+            fontraGuidelineToRawGuide(guideline) for guideline in layer.glyph.guidelines
+        ]
+        if not isBackgroundLayer:
+            rawLayer["width"] = normalizeRawValue(layer.glyph.xAdvance)
+
+    def _variableGlyphToGSGlyph(self, variableGlyph, gsGlyph):
+        sourceLayers = getCheckedSourceLayers(variableGlyph)
+
         defaultGlyphLocation = getDefaultLocation(variableGlyph.axes)
         nonParticipatingMasterIDs = set()
 
@@ -969,36 +2068,185 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
     def _updateKerningSidesForGlyph(self, rawGlyphData):
         glyphName = rawGlyphData["glyphname"]
         for pairSide, glyphSideAttr in self._kerningSideAttrs:
-            if pairSide not in self.kerningGroups:
-                continue
-            for groupName, glyphNames in self.kerningGroups[pairSide].items():
-                if glyphName in glyphNames:
-                    rawGlyphData[glyphSideAttr] = groupName
+            groupName = self.kerningGroupsByGlyph.get(pairSide, {}).get(glyphName)
+            if groupName is not None:
+                rawGlyphData[glyphSideAttr] = groupName
 
         # sort dict by key for easier round-tripping
         sortedData = {k: v for k, v in sorted(rawGlyphData.items())}
         rawGlyphData.clear()
         rawGlyphData.update(sortedData)
 
-    def _writeRawFontData(self, changedGlyphs=None):
-        # `changedGlyphs` is ignored, needed for glyphsPackage
-        rawFontData = dict(self.rawFontData)
-        rawFontData["glyphs"] = self.rawGlyphsData
+    def _resetPendingChanges(self):
+        self._pendingFontAttrs: set[str] = set()
+        self._pendingGlyphChanges: set[str] = set()
+        self._pendingGlyphDeletions: set[str] = set()
+        self._pendingGlyphSetChange = False
 
-        rawFontData = convertMatchesToTuples(rawFontData, matchTreeFont)
-        out = openstepPlistDumps(rawFontData)
-        self.path.write_text(out)
-        self.fileWatcherIgnoreNextChange(self.path)
+    def _hasPendingChanges(self):
+        return bool(self._pendingFontAttrs) or bool(self._pendingGlyphChanges)
+
+    def _markFontDataChanged(self, fontAttrs, changedGlyphs=None):
+        # The raw font data is updated right away, only writing it is deferred
+        self._updateRawFontData(fontAttrs)
+        self._pendingFontAttrs.update(fontAttrs)
+        if changedGlyphs:
+            self._pendingGlyphChanges.update(changedGlyphs)
+        self._writeChangesIfNotDeferred()
+
+    def _markGlyphChanged(self, glyphName, isNewGlyph):
+        self._pendingGlyphChanges.add(glyphName)
+        self.glyphDigests.pop(glyphName, None)
+        if isNewGlyph:
+            self._pendingGlyphSetChange = True
+        self._writeChangesIfNotDeferred()
+
+    def _markGlyphDeleted(self, glyphName):
+        self._pendingGlyphChanges.add(glyphName)
+        self.glyphDigests.pop(glyphName, None)
+        self._pendingGlyphDeletions.add(glyphName)
+        self._pendingGlyphSetChange = True
+        self._writeChangesIfNotDeferred()
+
+    def _writeChangesIfNotDeferred(self):
+        if self.flushInterval is None and not self._writesDeferred:
+            self._writePendingChanges()
+
+    @contextmanager
+    def _deferringWrites(self):
+        # Collect the changes made within the block, and write them at the end,
+        # also if the block fails halfway
+        if self._writesDeferred:
+            yield
+            return
+        self._writesDeferred = True
+        try:
+            yield
+        finally:
+            self._writesDeferred = False
+            self._writeChangesIfNotDeferred()
+
+    def _writePendingChanges(self):
+        if not self._hasPendingChanges():
+            return
+
+        try:
+            self._writeChanges(
+                bool(self._pendingFontAttrs),
+                self._pendingGlyphChanges,
+                self._pendingGlyphDeletions,
+                self._pendingGlyphSetChange,
+            )
+        except BaseException:
+            # The SpliceWriter may be out of sync: do a full write next time
+            self._spliceWriter = None
+            raise
+
+        self._resetPendingChanges()
+
+    def _scheduleFlush(self):
+        if self.flushInterval is None or self._flushTask is not None:
+            return
+        if self._hasPendingChanges():
+            self._flushTask = asyncio.create_task(self._flushAfterInterval())
+
+    async def _flushAfterInterval(self):
+        await asyncio.sleep(self.flushInterval)
+        self._flushTask = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"error while writing {self.path}: {e!r}")
+
+    async def flush(self) -> None:
+        """Write pending changes to disk."""
+        if not self._hasPendingChanges():
+            return
+        async with self._lock.writing():
+            await runInThread(self._writePendingChanges)
 
-    def _writeRawGlyph(self, glyphName, isNewGlyph):
-        # Write whole file with openstep_plist
-        # 'glyphName' and 'isNewGlyph' arguments not used, because we write the whole file,
-        # but is required for the glyphspackage backend
-        self._writeRawFontData()
+    def _writeChanges(
+        self, fontDataChanged, changedGlyphs, deletedGlyphs, glyphSetChanged
+    ):
+        # `glyphSetChanged` is ignored, needed for glyphsPackage
+        if fontDataChanged or self._spliceWriter is None:
+            self._writeRawFontData()
+            return
+
+        # Glyphs that were deleted, or deleted and added again, are removed from
+        # the SpliceWriter first. Then the added glyphs are inserted in order, so
+        # the glyphs before them are in place.
+        spliceWriter = self._spliceWriter
+        writtenGlyphNames = set(spliceWriter.glyphNames)
+        replacedGlyphs = []
+        addedGlyphs = []
+        for glyphName in changedGlyphs:
+            isWritten = glyphName in writtenGlyphNames
+            glyphIndex = self.glyphNameToIndex.get(glyphName)
+            if isWritten and (glyphIndex is None or glyphName in deletedGlyphs):
+                spliceWriter.deleteGlyph(glyphName)
+                isWritten = False
+            if glyphIndex is not None:
+                if isWritten:
+                    replacedGlyphs.append((glyphIndex, glyphName))
+                else:
+                    addedGlyphs.append((glyphIndex, glyphName))
 
-    def _updateDeletedGlyph(self, glyphName):
-        # `glyphName` is ignored, needed for glyphsPackage
-        self._writeRawFontData()
+        if addedGlyphs:
+            filePositions = {
+                glyphIndex: position
+                for position, glyphIndex in enumerate(
+                    self._getGlyphIndicesInFileOrder()
+                )
+            }
+            addedGlyphs.sort(key=lambda item: filePositions[item[0]])
+            for glyphIndex, glyphName in addedGlyphs:
+                spliceWriter.insertGlyph(
+                    filePositions[glyphIndex],
+                    glyphName,
+                    self._dumpsRawGlyphWithDigest(glyphName, glyphIndex),
+                )
+
+        for glyphIndex, glyphName in replacedGlyphs:
+            spliceWriter.replaceGlyph(
+                glyphName, self._dumpsRawGlyphWithDigest(glyphName, glyphIndex)
+            )
+
+        self._writeSplicedData()
+
+    def _dumpsRawGlyph(self, glyphIndex):
+        return openstepPlistDumpsGlyph(
+            parsedRawGlyphData(self.rawGlyphsData[glyphIndex])
+        )
+
+    def _dumpsRawGlyphWithDigest(self, glyphName, glyphIndex):
+        # Serialize the glyph for writing, and keep the digest of what we write
+        glyphText = self._dumpsRawGlyph(glyphIndex)
+        self.glyphDigests[glyphName] = glyphTextDigest(glyphText)
+        return glyphText
+
+    def _writeRawFontData(self):
+        # Write whole file with openstep_plist, and keep the SpliceWriter around
+        # so subsequent glyph writes only need to patch the glyph's own text
+        spliceWriter = self._spliceWriter = SpliceWriter.fromRawData(
+            self.rawFontData,
+            (
+                parsedRawGlyphData(glyphData)
+                for glyphData in self._getRawGlyphsDataInFileOrder()
+            ),
+        )
+        self.glyphDigests = {
+            glyphName: glyphTextDigest(spliceWriter.data[start:end])
+            for glyphName, (start, end) in zip(
+                spliceWriter.glyphNames, spliceWriter.glyphSpans
+            )
+        }
+        self._writeSplicedData()
+
+    def _writeSplicedData(self):
+        assert self._spliceWriter is not None
+        self._spliceWriter.write(self.path)
+        self.fileWatcherIgnoreNextChange(self.path)
 
     def _findNearestMasterId(self, fontLocation):
         masterIDs = list(self.locationByMasterID)
@@ -1007,22 +2255,45 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
         return masterIDs[index]
 
     async def aclose(self) -> None:
-        pass
+        if self._backgroundLoadingTask is not None:
+            self._backgroundLoadingTask.cancel()
+            self._backgroundLoadingTask = None
+        if self._flushTask is not None:
+            # The task hasn't started writing yet
+            self._flushTask.cancel()
+            self._flushTask = None
+        await self.flush()
+        if self._readExecutor is not None:
+            self._readExecutor.shutdown(wait=False)
+            self._readExecutor = None
 
     async def findGlyphsThatUseGlyph(self, glyphName: str) -> list[str]:
-        componentsKey = "components" if self.gsFont.format_version == 2 else "shapes"
-        baseGlyphKey = "name" if self.gsFont.format_version == 2 else "ref"
-
-        usedBy = set()
-
-        for glyphData in self.rawGlyphsData:
-            for layerData in glyphData["layers"]:
-                for compo in layerData.get(componentsKey, []):
-                    baseGlyph = compo.get(baseGlyphKey)
-                    if baseGlyph == glyphName:
-                        usedBy.add(glyphData["glyphname"])
-
-        return sorted(usedBy)
+        componentIndex = self._componentIndex
+        if componentIndex is None:
+            # Don't build the index while the glyphs are being changed
+            async with self._lock.reading():
+                componentIndex = self._getComponentIndex()
+        return sorted(componentIndex.getUsedBy(glyphName))
+
+    def _getComponentIndex(self) -> "ComponentIndex":
+        # The index is built when it is first needed, and then kept up to date
+        if self._componentIndex is None:
+            componentIndex = ComponentIndex(self.gsFont.format_version)
+            for glyphData in self.rawGlyphsData:
+                if glyphData is None:
+                    continue
+                if isinstance(glyphData, UnparsedGlyphData):
+                    if not componentIndex.mayHaveComponents(glyphData.text):
+                        continue
+                    # Don't keep the parsed data around, we only need it once
+                    glyphData = glyphData.parse()
+                componentIndex.updateGlyph(glyphData["glyphname"], glyphData)
+            self._componentIndex = componentIndex
+        return self._componentIndex
+
+    def _updateComponentIndex(self, glyphName, rawGlyphData) -> None:
+        if self._componentIndex is not None:
+            self._componentIndex.updateGlyph(glyphName, rawGlyphData)
 
     def fileWatcherWasInstalled(self):
         self._updatePathsToWatch()
@@ -1033,6 +2304,16 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
 
     async def fileWatcherProcessChanges(
         self, changes: set[tuple[Change, str]]
+    ) -> dict[str, Any] | None:
+        async with self._lock.writing():
+            reloadPattern = self._processChanges(changes)
+        if self.backgroundLoading:
+            # Reloaded glyphs may need loading
+            self._startBackgroundLoading()
+        return reloadPattern
+
+    def _processChanges(
+        self, changes: set[tuple[Change, str]]
     ) -> dict[str, Any] | None:
         reloadPattern: dict[str, Any] = {}
         glyphChanges = set()
@@ -1044,57 +2325,447 @@ class GlyphsBackend(WatchableBackend, WritableBaseBackend):
 
         if featuresChanged and len(changes) == 1:
             self._cachedFeatures = None
+            self._cachedKerning = None
             reloadPattern["features"] = None
             return reloadPattern
 
-        rawFontData, rawGlyphsData = self._loadFiles()
+        rawFontData, rawGlyphsData, glyphDigests = self._loadFiles()
+        self._saveParseCache()
+        if self._hasPendingChanges():
+            self._mergePendingFontData(rawFontData)
+            rawGlyphsData = self._mergePendingGlyphChanges(rawGlyphsData)
+            # The SpliceWriter doesn't know about the external changes
+            self._spliceWriter = None
 
         if rawFontData != self.rawFontData:
-            self._setupWithRawData(rawFontData, rawGlyphsData)
-            # Reload everything
-            return None
+            fontDataReloadPattern = self._updateFontDataFromExternalChanges(rawFontData)
+            if fontDataReloadPattern is None:
+                self._setupWithRawData(rawFontData, rawGlyphsData)
+                self.glyphDigests = glyphDigests
+                # Reload everything
+                return None
+            reloadPattern.update(fontDataReloadPattern)
+
+        newGlyphs = {glyphData["glyphname"]: glyphData for glyphData in rawGlyphsData}
+        oldGlyphNames = set(self.glyphNameToIndex)
+        newGlyphNames = set(newGlyphs)
+        glyphSetChanges = oldGlyphNames ^ newGlyphNames
+        glyphMapChanged = bool(glyphSetChanges)
+        for glyphName in oldGlyphNames & newGlyphNames:
+            # Only compare the glyph data if the digests differ: the glyph record
+            # may just be formatted differently
+            digest = glyphDigests.get(glyphName)
+            if digest is not None and digest == self.glyphDigests.get(glyphName):
+                continue
+            oldGlyphData = self.rawGlyphsData[self.glyphNameToIndex[glyphName]]
+            newGlyphData = newGlyphs[glyphName]
+            if oldGlyphData != newGlyphData:
+                glyphChanges.add(glyphName)
+                if oldGlyphData.get("unicode") != newGlyphData.get("unicode"):
+                    glyphMapChanged = True
+
+        if glyphSetChanges or glyphChanges:
+            reloadPattern["glyphs"] = dict.fromkeys(
+                sorted(glyphSetChanges | glyphChanges)
+            )
 
-        if rawGlyphsData != self.rawGlyphsData:
-            oldGlyphs = {
-                glyphData["glyphname"]: glyphData for glyphData in self.rawGlyphsData
-            }
-            newGlyphs = {
-                glyphData["glyphname"]: glyphData for glyphData in rawGlyphsData
-            }
-            oldGlyphNames = set(oldGlyphs)
-            newGlyphNames = set(newGlyphs)
-            glyphSetChanges = oldGlyphNames ^ newGlyphNames
-            glyphMapChanged = bool(glyphSetChanges)
-            glyphChanges = {
-                glyphName
-                for glyphName in oldGlyphNames & newGlyphNames
-                if oldGlyphs[glyphName] != newGlyphs[glyphName]
-            }
-            if not glyphMapChanged:
-                glyphMapChanged = any(
-                    oldGlyphs[glyphName].get("unicode")
-                    != newGlyphs[glyphName].get("unicode")
-                    for glyphName in glyphChanges
+        if glyphMapChanged:
+            reloadPattern["glyphMap"] = None
+            self._cachedGlyphClassifications = None
+            self._cachedKerning = None
+
+        if glyphChanges or glyphMapChanged:
+            componentIndex = self._componentIndex
+            self._updateRawGlyphsData(rawGlyphsData)
+            self._componentIndex = componentIndex
+            for glyphName in sorted(glyphSetChanges | glyphChanges):
+                glyphData = newGlyphs.get(glyphName)
+                self._updateComponentIndex(
+                    glyphName,
+                    None if glyphData is None else parsedRawGlyphData(glyphData),
                 )
+                self._discardCachedGlyph(glyphName)
+
+        # Keep the digests of the unchanged glyphs if the files weren't scanned
+        # for the glyph records
+        for glyphName in glyphSetChanges | glyphChanges:
+            self.glyphDigests.pop(glyphName, None)
+        self.glyphDigests.update(glyphDigests)
+        # Glyphs with changes that weren't written yet don't match the file
+        for glyphName in self._pendingGlyphChanges:
+            self.glyphDigests.pop(glyphName, None)
+
+        if featuresChanged:
+            self._cachedFeatures = None
+            self._cachedKerning = None
+            reloadPattern["features"] = None
 
-            if glyphSetChanges or glyphChanges:
-                reloadPattern["glyphs"] = dict.fromkeys(
-                    sorted(glyphSetChanges | glyphChanges)
-                )
+        return reloadPattern
 
-            if glyphMapChanged:
-                reloadPattern["glyphMap"] = None
-                self._cachedGlyphClassifications = None
+    def _mergePendingFontData(self, rawFontData: dict[str, Any]) -> None:
+        # Apply the font data changes that weren't written yet to the externally
+        # changed font data, so they aren't lost when it is reloaded
+        if self._pendingFontAttrs:
+            self._updateRawFontData(self._pendingFontAttrs, rawFontData)
+
+    def _mergePendingGlyphChanges(self, rawGlyphsData: list[Any]) -> list[Any]:
+        # Return the externally changed glyph data, with the glyphs that have
+        # changes that weren't written yet replaced by our own version
+        pendingGlyphNames = self._pendingGlyphChanges
+        if not pendingGlyphNames:
+            return rawGlyphsData
+        mergedGlyphsData = []
+        for glyphData in rawGlyphsData:
+            glyphName = glyphData["glyphname"]
+            if glyphName in pendingGlyphNames:
+                glyphIndex = self.glyphNameToIndex.get(glyphName)
+                if glyphIndex is None:
+                    # We deleted the glyph
+                    continue
+                glyphData = self.rawGlyphsData[glyphIndex]
+            mergedGlyphsData.append(glyphData)
+        # Our new glyphs follow the glyphs from the file
+        loadedGlyphNames = {glyphData["glyphname"] for glyphData in rawGlyphsData}
+        mergedGlyphsData.extend(
+            glyphData
+            for glyphData in self._getRawGlyphsDataInFileOrder()
+            if glyphData["glyphname"] in pendingGlyphNames
+            and glyphData["glyphname"] not in loadedGlyphNames
+        )
+        return mergedGlyphsData
 
-            if glyphChanges or glyphMapChanged:
-                self._updateRawGlyphsData(rawGlyphsData)
+    def _updateFontDataFromExternalChanges(
+        self, rawFontData: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        # Apply externally changed font data (without glyphs), and return the
+        # reload pattern, or None if the whole font needs to be reloaded, in which
+        # case nothing is changed
+        reloadPattern: dict[str, Any] = {}
+        for key in sorted(set(rawFontData) | set(self.rawFontData)):
+            oldValue = self.rawFontData.get(key)
+            newValue = rawFontData.get(key)
+            if oldValue == newValue:
+                continue
+            if key == "customParameters":
+                changedNames = getChangedCustomParameterNames(oldValue, newValue)
+                if changedNames & AXIS_CUSTOM_PARAMETER_NAMES:
+                    return None
+                reloadPattern["fontInfo"] = None
+            elif key in RAW_FONT_DATA_RELOAD_KEYS:
+                rootKey = RAW_FONT_DATA_RELOAD_KEYS[key]
+                if rootKey is not None:
+                    reloadPattern[rootKey] = None
+            else:
+                return None
 
-            if featuresChanged:
-                self._cachedFeatures = None
-                reloadPattern["features"] = None
+        gsFont = glyphsLib.classes.GSFont()
+        parser = glyphsLib.parser.Parser(current_type=gsFont.__class__)
+        parser.parse_into_object(gsFont, rawFontData)
+        # The axes and masters didn't change, so the parsed glyphs can move over
+        gsFont.glyphs = self.gsFont.glyphs
+
+        self.gsFont = gsFont
+        self.rawFontData = rawFontData
+        # The file layout changed
+        self._spliceWriter = None
+
+        if "features" in reloadPattern:
+            self._cachedFeatures = None
+            self._cachedGlyphClassifications = None
+            self._cachedKerning = None
+        if "kerning" in reloadPattern:
+            self._cachedKerning = None
 
         return reloadPattern
 
+    def _updateGlyphsFromExternalChanges(
+        self, newGlyphsData: dict[str, Any], newGlyphDigests: dict[str, str]
+    ) -> dict[str, Any]:
+        # Apply the glyph data of externally changed glyphs, None for deleted
+        # glyphs, and return the reload pattern
+        changedGlyphNames = []
+        glyphMapChanged = glyphInfosChanged = kerningGroupsChanged = False
+
+        for glyphName, glyphData in newGlyphsData.items():
+            glyphIndex = self.glyphNameToIndex.get(glyphName)
+            digest = newGlyphDigests.get(glyphName)
+            if glyphIndex is None:
+                if glyphData is None:
+                    continue
+                self._appendGlyphSlot(glyphName, glyphData)
+            elif glyphData is None:
+                self._removeGlyphSlot(glyphName)
+            elif (
+                digest is not None and digest == self.glyphDigests.get(glyphName)
+            ) or self.rawGlyphsData[glyphIndex] == glyphData:
+                # The file was touched, but its glyph data is the same
+                if digest is not None and glyphName not in self._pendingGlyphChanges:
+                    self.glyphDigests[glyphName] = digest
+                continue
+            else:
+                self.rawGlyphsData[glyphIndex] = glyphData
+
+            if digest is None:
+                self.glyphDigests.pop(glyphName, None)
+            else:
+                self.glyphDigests[glyphName] = digest
+
+            changedGlyphNames.append(glyphName)
+            self.parsedGlyphs.pop(glyphName, None)
+            self._discardCachedGlyph(glyphName)
+            self._updateComponentIndex(
+                glyphName,
+                None if glyphData is None else parsedRawGlyphData(glyphData),
+            )
+
+            if glyphData is None:
+                codePoints, glyphInfo, groupsBySide = None, {}, {}
+            else:
+                codePoints, glyphInfo, groupsBySide = self._readGlyphInfo(glyphData)
+
+            if self.glyphMap.get(glyphName) != codePoints:
+                if codePoints is None:
+                    del self.glyphMap[glyphName]
+                else:
+                    self.glyphMap[glyphName] = codePoints
+                glyphMapChanged = True
+
+            if self.glyphInfos.get(glyphName, {}) != glyphInfo:
+                if glyphInfo:
+                    self.glyphInfos[glyphName] = glyphInfo
+                else:
+                    del self.glyphInfos[glyphName]
+                glyphInfosChanged = True
+
+            if self._updateKerningGroupsForGlyph(glyphName, groupsBySide):
+                kerningGroupsChanged = True
+
+        reloadPattern: dict[str, Any] = {}
+        if changedGlyphNames:
+            reloadPattern["glyphs"] = dict.fromkeys(sorted(changedGlyphNames))
+        if glyphMapChanged:
+            reloadPattern["glyphMap"] = None
+            self._glyphMapChanged()
+            self._cachedGlyphClassifications = None
+            self._cachedKerning = None
+        if glyphInfosChanged:
+            self._glyphInfosChanged()
+        if kerningGroupsChanged:
+            reloadPattern["kerning"] = None
+            self._cachedKerning = None
+        return reloadPattern
+
+    def _updateKerningGroupsForGlyph(self, glyphName, groupsBySide) -> bool:
+        # Move the glyph to the kerning groups in `groupsBySide`, return whether
+        # anything changed
+        changed = False
+        for pairSide, _ in self._kerningSideAttrs:
+            groups = self.kerningGroups[pairSide]
+            groupsByGlyph = self.kerningGroupsByGlyph.setdefault(pairSide, {})
+            currentGroupName = groupsByGlyph.get(glyphName)
+            groupName = groupsBySide.get(pairSide)
+            if currentGroupName == groupName:
+                continue
+            if currentGroupName is not None:
+                glyphNames = [
+                    gn for gn in groups.get(currentGroupName, ()) if gn != glyphName
+                ]
+                if glyphNames:
+                    groups[currentGroupName] = glyphNames
+                else:
+                    groups.pop(currentGroupName, None)
+                del groupsByGlyph[glyphName]
+            if groupName is not None:
+                groups[groupName] = list(groups.get(groupName, ())) + [glyphName]
+                groupsByGlyph[glyphName] = groupName
+            changed = True
+        return changed
+
+
+def getKerningGroupsByGlyph(kerningGroups):
+    # Return a {pairSide: {glyphName: groupName}} dict. If a glyph is in more
+    # than one group for a side, the first group wins.
+    kerningGroupsByGlyph = {}
+    for pairSide, groups in kerningGroups.items():
+        groupsByGlyph = kerningGroupsByGlyph[pairSide] = {}
+        for groupName, glyphNames in groups.items():
+            for glyphName in glyphNames:
+                groupsByGlyph.setdefault(glyphName, groupName)
+    return kerningGroupsByGlyph
+
+
+def getChangedCustomParameterNames(oldParameters, newParameters) -> set[str]:
+    # Return the names of the raw custom parameters that were added, removed or
+    # changed
+    def parametersByName(parameters):
+        result = defaultdict(list)
+        for parameter in parameters or ():
+            result[parameter.get("name")].append(parameter)
+        return result
+
+    oldByName = parametersByName(oldParameters)
+    newByName = parametersByName(newParameters)
+    return {
+        name
+        for name in oldByName.keys() | newByName.keys()
+        if oldByName.get(name) != newByName.get(name)
+    }
+
+
+class ReadWriteLock:
+    """An asyncio lock that can be held by many readers at once, or by a single
+    writer. Waiting writers go before new readers.
+    """
+
+    def __init__(self) -> None:
+        self._condition = asyncio.Condition()
+        self._numReaders = 0
+        self._numWaitingWriters = 0
+        self._isWriting = False
+
+    @asynccontextmanager
+    async def reading(self):
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: not self._isWriting and not self._numWaitingWriters
+            )
+            self._numReaders += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._numReaders -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def writing(self):
+        async with self._condition:
+            self._numWaitingWriters += 1
+            try:
+                await self._condition.wait_for(
+                    lambda: not self._isWriting and not self._numReaders
+                )
+            finally:
+                self._numWaitingWriters -= 1
+                # Readers may have waited for us, also if we were cancelled
+                self._condition.notify_all()
+            self._isWriting = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._isWriting = False
+                self._condition.notify_all()
+
+
+class VariableGlyphCache:
+    """A least recently used cache of VariableGlyph objects, with a maximum for
+    their estimated total size in bytes.
+    """
+
+    def __init__(self, maxBytes: int) -> None:
+        self.maxBytes = maxBytes
+        self.numBytes = 0
+        # Glyph names in least recently used order, with the glyph and its size
+        self.glyphs: dict[str, tuple[VariableGlyph, int]] = {}
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, glyphName: str) -> VariableGlyph | None:
+        item = self.glyphs.pop(glyphName, None)
+        if item is None:
+            self.counters["misses"] += 1
+            return None
+        self.counters["hits"] += 1
+        self.glyphs[glyphName] = item
+        return item[0]
+
+    def put(self, glyphName: str, glyph: VariableGlyph) -> None:
+        self.discard(glyphName)
+        size = estimateGlyphSize(glyph)
+        if size > self.maxBytes:
+            return
+        self.glyphs[glyphName] = (glyph, size)
+        self.numBytes += size
+        while self.numBytes > self.maxBytes:
+            self.discard(next(iter(self.glyphs)))
+            self.counters["evictions"] += 1
+
+    def discard(self, glyphName: str) -> None:
+        item = self.glyphs.pop(glyphName, None)
+        if item is not None:
+            self.numBytes -= item[1]
+
+
+def estimateGlyphSize(glyph: VariableGlyph) -> int:
+    # A rough estimate of the memory used by a VariableGlyph. The glyphs we
+    # convert always have a PackedPath.
+    size = 1000
+    for layer in glyph.layers.values():
+        staticGlyph = layer.glyph
+        numItems = (
+            len(staticGlyph.components)
+            + len(staticGlyph.anchors)
+            + len(staticGlyph.guidelines)
+        )
+        size += 500 + 40 * len(staticGlyph.path.coordinates) + 500 * numItems
+    return size
+
+
+class ComponentIndex:
+    """Maps base glyph names to the names of the glyphs that use them as a
+    component, in any layer or layer background.
+    """
+
+    def __init__(self, formatVersion: int) -> None:
+        self.componentsKey = "components" if formatVersion == 2 else "shapes"
+        self.baseGlyphKey = "name" if formatVersion == 2 else "ref"
+        self.usedBy: dict[str, set[str]] = defaultdict(set)
+        self.baseGlyphs: dict[str, set[str]] = {}
+
+    def mayHaveComponents(self, glyphText: bytes) -> bool:
+        # Cheap test for unparsed glyph data
+        return f"{self.baseGlyphKey} = ".encode("utf-8") in glyphText
+
+    def getUsedBy(self, baseGlyphName: str) -> set[str]:
+        return self.usedBy.get(baseGlyphName, set())
+
+    def updateGlyph(self, glyphName: str, rawGlyphData: dict | None) -> None:
+        """Update the index for a changed glyph, or for a deleted glyph if
+        `rawGlyphData` is None.
+        """
+        for baseGlyphName in self.baseGlyphs.pop(glyphName, ()):
+            usedBy = self.usedBy[baseGlyphName]
+            usedBy.discard(glyphName)
+            if not usedBy:
+                del self.usedBy[baseGlyphName]
+
+        if rawGlyphData is None:
+            return
+
+        baseGlyphNames = self.getBaseGlyphNames(rawGlyphData)
+        if baseGlyphNames:
+            self.baseGlyphs[glyphName] = baseGlyphNames
+            for baseGlyphName in baseGlyphNames:
+                self.usedBy[baseGlyphName].add(glyphName)
+
+    def getBaseGlyphNames(self, rawGlyphData: dict) -> set[str]:
+        """Return the names of the glyphs used as a component by the glyph."""
+        baseGlyphNames = set()
+        for layerData in rawGlyphData.get("layers", ()):
+            for shapesData in [layerData, layerData.get("background", {})]:
+                for compo in shapesData.get(self.componentsKey, ()):
+                    baseGlyphName = compo.get(self.baseGlyphKey)
+                    if baseGlyphName is not None:
+                        baseGlyphNames.add(baseGlyphName)
+        return baseGlyphNames
+
+
+def parsedRawGlyphData(glyphData):
+    # Parse lazily loaded glyph data, without storing the result
+    if isinstance(glyphData, UnparsedGlyphData):
+        return glyphData.parse()
+    return glyphData
+
 
 def getSourceLayerNames(variableGlyph):
     sourceLayers = {
@@ -1120,6 +2791,18 @@ def getSourceLayerNames(variableGlyph):
     return sourceLayers, sourceLayerNames
 
 
+def getCheckedSourceLayers(variableGlyph):
+    sourceLayers, sourceLayerNames = getSourceLayerNames(variableGlyph)
+    nonSourceLayerNames = set(variableGlyph.layers) - sourceLayerNames
+
+    if nonSourceLayerNames:
+        raise GlyphsBackendError(
+            "GlyphsApp Backend: Layer without glyph source is not supported."
+        )
+
+    return sourceLayers
+
+
 def getDefaultLocation(axes):
     return {axis.name: axis.defaultValue for axis in axes}
 
@@ -1171,8 +2854,8 @@ def setupLayerInfo(
             gsLayerName = localLayerName
             gsLayerId = getLayerId(variableGlyph, layerName, None)
             shouldStoreFontraLayerName = False
-            if gsLayerId not in gsGlyph.layers:
-                if sourceInfo.isBraceLayer:
+            if sourceInfo.isBraceLayer:
+                if gsLayerId not in gsGlyph.layers:
                     raise GlyphsBackendError(
                         "A brace layer can only have an additional source "
                         "layer named 'background'"
@@ -1252,6 +2935,32 @@ def updateGSLayer(
     return gsLayer
 
 
+def updateRawLayer(layerName, glyphSource, rawLayer, sourceInfo, layerInfo):
+    # Equivalent to updateGSLayer(), for glyphs without glyph axes
+    if layerInfo.isBackgroundLayer:
+        return rawLayer.setdefault("background", {})
+
+    rawLayer["name"] = layerInfo.gsLayerName
+    rawLayer["associatedMasterId"] = sourceInfo.associatedMasterId
+    userData = rawLayer.setdefault("userData", {})
+
+    storeInDict(
+        userData,
+        "xyz.fontra.layer-name",
+        layerName,
+        layerName != layerInfo.gsLayerId and layerInfo.shouldStoreFontraLayerName,
+    )
+
+    storeInDict(
+        userData,
+        "xyz.fontra.source-name",
+        glyphSource.name,
+        glyphSource.name and layerInfo.shouldStoreFontraSourceName,
+    )
+
+    return rawLayer
+
+
 def isGlyphsUUID(maybeUUID):
     try:
         u = uuid.UUID(maybeUUID)
@@ -1285,6 +2994,10 @@ class GlyphsPackageBackend(GlyphsBackend):
     orderFileName = "order.plist"
     glyphsFolderName = "glyphs"
 
+    # The number of workers used to read and parse the .glyph files in parallel,
+    # or 0 to load them sequentially
+    loadingWorkers = 0
+
     @property
     def fontInfoPath(self):
         return self.path / self.fontInfoFileName
@@ -1297,19 +3010,51 @@ class GlyphsPackageBackend(GlyphsBackend):
     def glyphsPath(self):
         return self.path / self.glyphsFolderName
 
-    def _loadFiles(self) -> tuple[dict[str, Any], list[Any]]:
+    def _loadFiles(self) -> tuple[dict[str, Any], list[Any], dict[str, str]]:
+        # Scanning is cheap, so like for .glyphs files, the parse cache isn't
+        # used with lazy loading
+        parseCache = self._parseCache = (
+            None if self._scansGlyphHeaders else self._openParseCache()
+        )
+        loadPlist = (
+            openstepPlistFromPath
+            if parseCache is None
+            else parseCache.openstepPlistFromPath
+        )
+
         glyphOrder = []
         if self.orderPath.exists():
-            glyphOrder = openstepPlistFromPath(self.orderPath)
+            glyphOrder = loadPlist(self.orderPath)
         glyphNameToIndex = {glyphName: i for i, glyphName in enumerate(glyphOrder)}
 
-        rawFontData = openstepPlistFromPath(self.fontInfoPath)
+        # Don't modify the cached object, it gets saved after loading
+        rawFontData = dict(loadPlist(self.fontInfoPath))
         rawFontData["glyphs"] = []
 
-        rawGlyphsData = []
-        for glyphPath in self.glyphsPath.glob("*.glyph"):
-            glyphData = openstepPlistFromPath(glyphPath)
-            rawGlyphsData.append(glyphData)
+        glyphPaths = list(self.glyphsPath.glob("*.glyph"))
+        if parseCache is None:
+            rawGlyphsData, digests = self._loadGlyphFiles(glyphPaths)
+        else:
+            # The cache entries of the .glyph files are (glyphData, digest) tuples
+            cachedEntries = [parseCache.get(glyphPath) for glyphPath in glyphPaths]
+            missingIndices = [
+                i for i, entry in enumerate(cachedEntries) if entry is None
+            ]
+            missingPaths = [glyphPaths[i] for i in missingIndices]
+            stats = [os.stat(glyphPath) for glyphPath in missingPaths]
+            missingGlyphsData, missingDigests = self._loadGlyphFiles(missingPaths)
+            for i, glyphPath, stat, glyphData, digest in zip(
+                missingIndices, missingPaths, stats, missingGlyphsData, missingDigests
+            ):
+                cachedEntries[i] = (glyphData, digest)
+                parseCache.put(glyphPath, (glyphData, digest), stat, digest)
+            rawGlyphsData = [glyphData for glyphData, _ in cachedEntries]
+            digests = [digest for _, digest in cachedEntries]
+
+        glyphDigests = {
+            glyphData["glyphname"]: digest
+            for glyphData, digest in zip(rawGlyphsData, digests)
+        }
 
         rawGlyphsData.sort(
             key=lambda glyphData: (
@@ -1318,9 +3063,117 @@ class GlyphsPackageBackend(GlyphsBackend):
             )
         )
 
-        return rawFontData, rawGlyphsData
+        return rawFontData, rawGlyphsData, glyphDigests
+
+    def _processChanges(
+        self, changes: set[tuple[Change, str]]
+    ) -> dict[str, Any] | None:
+        # Only reload the .glyph files that changed, and order.plist and
+        # fontinfo.plist if they changed. Other changes go through the full reload.
+        glyphsPath = self.glyphsPath.resolve()
+        orderPath = self.orderPath.resolve()
+        fontInfoPath = self.fontInfoPath.resolve()
+        changedGlyphPaths = set()
+        orderChanged = fontInfoChanged = False
+        for change, path in changes:
+            path = pathlib.Path(path).resolve()
+            if path == orderPath:
+                orderChanged = True
+            elif path == fontInfoPath:
+                fontInfoChanged = True
+            elif path.parent == glyphsPath and path.suffix == ".glyph":
+                changedGlyphPaths.add(path)
+            else:
+                return super()._processChanges(changes)
+
+        reloadPattern: dict[str, Any] = {}
+        if fontInfoChanged:
+            rawFontData = dict(openstepPlistFromPath(self.fontInfoPath))
+            rawFontData["glyphs"] = []
+            self._mergePendingFontData(rawFontData)
+            if rawFontData != self.rawFontData:
+                fontDataReloadPattern = self._updateFontDataFromExternalChanges(
+                    rawFontData
+                )
+                if fontDataReloadPattern is None:
+                    return super()._processChanges(changes)
+                reloadPattern.update(fontDataReloadPattern)
+
+        if orderChanged:
+            glyphOrder = (
+                openstepPlistFromPath(self.orderPath) if self.orderPath.exists() else []
+            )
+            self.originalGlyphNameToIndex = {
+                glyphName: i for i, glyphName in enumerate(glyphOrder)
+            }
+            self._glyphIndicesInFileOrder = None
+
+        newGlyphsData: dict[str, Any] = {}
+        newGlyphDigests: dict[str, str] = {}
+        glyphNamesByFileName = None
+        for glyphPath in sorted(changedGlyphPaths):
+            try:
+                glyphData, digest = self._readGlyphFile(glyphPath)
+            except FileNotFoundError:
+                if glyphNamesByFileName is None:
+                    glyphNamesByFileName = {
+                        self.getGlyphFilePath(glyphName).name: glyphName
+                        for glyphName in self.glyphNameToIndex
+                    }
+                glyphName = glyphNamesByFileName.get(glyphPath.name)
+                if glyphName is not None:
+                    newGlyphsData.setdefault(glyphName, None)
+            else:
+                newGlyphsData[glyphData["glyphname"]] = glyphData
+                newGlyphDigests[glyphData["glyphname"]] = digest
+
+        # Our changes that weren't written yet win over the external changes
+        for glyphName in self._pendingGlyphChanges:
+            newGlyphsData.pop(glyphName, None)
+
+        reloadPattern.update(
+            self._updateGlyphsFromExternalChanges(newGlyphsData, newGlyphDigests)
+        )
+        return reloadPattern
+
+    def _loadGlyphFiles(self, glyphPaths) -> tuple[list[Any], list[str]]:
+        # Return the glyph data and the digests of the .glyph files
+        if self.loadingWorkers and not self._scansGlyphHeaders:
+            return openstepPlistsFromPathsParallel(glyphPaths, self.loadingWorkers)
+        glyphsData = []
+        digests = []
+        for glyphPath in glyphPaths:
+            glyphData, digest = self._readGlyphFile(glyphPath)
+            glyphsData.append(glyphData)
+            digests.append(digest)
+        return glyphsData, digests
+
+    def _readGlyphFile(self, glyphPath) -> tuple[Any, str]:
+        if self._scansGlyphHeaders:
+            # Only scan the header keys, see GlyphsBackend._scanFiles()
+            data = glyphPath.read_bytes()
+            return UnparsedGlyphData.fromText(data), glyphTextDigest(data)
+        return openstepPlistAndDigestFromPath(glyphPath)
+
+    def _writeChanges(
+        self, fontDataChanged, changedGlyphs, deletedGlyphs, glyphSetChanged
+    ):
+        if fontDataChanged:
+            self._writeRawFontData()
+
+        for glyphName in sorted(changedGlyphs):
+            if glyphName in self.glyphNameToIndex:
+                self._writeRawGlyph(glyphName)
+            else:
+                # The glyph may have been added and deleted before it got written
+                filePath = self.getGlyphFilePath(glyphName)
+                filePath.unlink(missing_ok=True)
+                self.fileWatcherIgnoreNextChange(filePath)
+
+        if glyphSetChanged:
+            self._updateGlyphOrder()
 
-    def _writeRawFontData(self, changedGlyphs=None):
+    def _writeRawFontData(self):
         rawFontData = convertMatchesToTuples(self.rawFontData, matchTreeFont)
 
         # There can be an empty glyphs list at this point, which we don't want
@@ -1331,35 +3184,22 @@ class GlyphsPackageBackend(GlyphsBackend):
         self.fontInfoPath.write_text(out, encoding="utf=8")
         self.fileWatcherIgnoreNextChange(self.fontInfoPath)
 
-        if changedGlyphs:
-            for glyphName in sorted(changedGlyphs):
-                self._writeRawGlyph(glyphName, False)
-
-    def _writeRawGlyph(self, glyphName, isNewGlyph):
-        rawGlyphData = self.rawGlyphsData[self.glyphNameToIndex[glyphName]]
-        rawGlyphData = convertMatchesToTuples(rawGlyphData, matchTreeGlyph)
-        out = openstepPlistDumps(rawGlyphData)
+    def _writeRawGlyph(self, glyphName):
+        out = self._dumpsRawGlyphWithDigest(glyphName, self.glyphNameToIndex[glyphName])
         filePath = self.getGlyphFilePath(glyphName)
         filePath.write_text(out, encoding="utf=8")
         self.fileWatcherIgnoreNextChange(filePath)
 
-        if isNewGlyph:
-            self._updateGlyphOrder()
-
-    def _updateDeletedGlyph(self, glyphName):
-        filePath = self.getGlyphFilePath(glyphName)
-        filePath.unlink()
-        self.fileWatcherIgnoreNextChange(filePath)
-        self._updateGlyphOrder()
-
     def _updateGlyphOrder(self):
-        glyphOrder = [glyph["glyphname"] for glyph in self.rawGlyphsData]
+        glyphOrder = [
+            glyphData["glyphname"] for glyphData in self._getRawGlyphsDataInFileOrder()
+        ]
         out = openstepPlistDumps(glyphOrder)
         self.orderPath.write_text(out, encoding="utf=8")
         self.fileWatcherIgnoreNextChange(self.orderPath)
 
     def getGlyphFilePath(self, glyphName):
-        refFileName = userNameToFileName(glyphName, suffix=".glyph")
+        refFileName = ufoLibFilenames.userNameToFileName(glyphName, suffix=".glyph")
         return self.glyphsPath / refFileName
 
 
@@ -1368,7 +3208,7 @@ def gsLayerToFontraLayer(gsLayer, globalAxisNames, gsLayerWidth, gsLayerId):
     gsLayer.drawPoints(pen)
 
     components = [
-        gsComponentToFontraComponent(gsComponent, gsLayer, globalAxisNames)
+        gsComponentToFontraComponent(gsComponent, globalAxisNames)
         for gsComponent in gsLayer.components
     ]
 
@@ -1393,7 +3233,7 @@ def gsLayerToFontraLayer(gsLayer, globalAxisNames, gsLayerWidth, gsLayerId):
     )
 
 
-def gsComponentToFontraComponent(gsComponent, gsLayer, globalAxisNames):
+def gsComponentToFontraComponent(gsComponent, globalAxisNames):
     component = Component(
         name=gsComponent.name,
         transformation=DecomposedTransform.fromTransform(gsComponent.transform),
@@ -1416,6 +3256,101 @@ def gsComponentToFontraComponent(gsComponent, gsLayer, globalAxisNames):
     return component
 
 
+def rawLayerToFontraLayer(rawLayer, componentParser, globalAxisNames, width, layerId):
+    pen = PackedPathPointPen()
+    components = []
+    for rawShape in rawLayer.get("shapes", ()):
+        if "ref" in rawShape:
+            # Let glyphsLib deal with the component transform fields
+            gsComponent = glyphsLib.classes.GSComponent()
+            componentParser.parse_into_object(gsComponent, rawShape)
+            components.append(
+                gsComponentToFontraComponent(gsComponent, globalAxisNames)
+            )
+        else:
+            drawRawPathPoints(rawShape, pen)
+
+    anchors = [
+        rawAnchorToFontraAnchor(rawAnchor) for rawAnchor in rawLayer.get("anchors", ())
+    ]
+    guidelines = [
+        rawGuideToFontraGuideline(rawGuide) for rawGuide in rawLayer.get("guides", ())
+    ]
+
+    customData = {"com.glyphsapp.layer.layerId": layerId} if layerId is not None else {}
+
+    return Layer(
+        glyph=StaticGlyph(
+            xAdvance=width,
+            path=pen.getPath(),
+            components=components,
+            anchors=anchors,
+            guidelines=guidelines,
+        ),
+        customData=customData,
+    )
+
+
+rawNodeSegmentTypes = {"c": "curve", "l": "line", "q": "qcurve"}
+
+
+def drawRawPathPoints(rawPath, pointPen):
+    # This makes the same pen calls as glyphsLib's GSPath.drawPoints(), for
+    # a format 3 raw path. Its nodes are (x, y, type[, userData]) lists.
+    nodes = list(rawPath.get("nodes", ()))
+
+    pointPen.beginPath()
+
+    if nodes:
+        if not rawPath.get("closed", True):
+            x, y, nodeType, *nodeData = nodes.pop(0)
+            assert nodeType[0] == "l", "Open path starts with off-curve points"
+            userData = dict(nodeData[0]) if nodeData else {}
+            pointPen.addPoint(
+                (x, y),
+                segmentType="move",
+                name=userData.pop("name", None),
+                userData=userData,
+            )
+        else:
+            # The starting node of a closed contour is stored at the end
+            nodes.insert(0, nodes.pop())
+
+        for x, y, nodeType, *nodeData in nodes:
+            userData = dict(nodeData[0]) if nodeData else {}
+            pointPen.addPoint(
+                (x, y),
+                segmentType=rawNodeSegmentTypes.get(nodeType[0]),
+                smooth=nodeType.endswith("s"),
+                name=userData.pop("name", None),
+                userData=userData,
+            )
+
+    pointPen.endPath()
+
+
+def rawAnchorToFontraAnchor(rawAnchor):
+    x, y = rawAnchor.get("pos", (0, 0))
+    userData = rawAnchor.get("userData")
+    return Anchor(
+        name=rawAnchor.get("name", ""),
+        x=x,
+        y=y,
+        customData=dict(userData) if userData else dict(),
+    )
+
+
+def rawGuideToFontraGuideline(rawGuide):
+    x, y = rawGuide.get("pos", (0, 0))
+    return Guideline(
+        x=x,
+        y=y,
+        angle=rawGuide.get("angle", 0),
+        name=rawGuide.get("name", ""),
+        locked=bool(rawGuide.get("locked", False)),
+    )
+
+
 def disambiguateLocalAxisName(axisName, globalAxisNames):
     return f"{axisName} (local)" if axisName in globalAxisNames else axisName
 
@@ -1446,10 +3381,11 @@ def gsGuidelineToFontraGuideline(gsGuideline):
 class MinimalUFOBuilder:
     def __init__(self, gsFont):
         self.font = gsFont
-        self.designspace = DesignSpaceDocument()
+        self.designspace = designspaceLib.DesignSpaceDocument()
         self.minimize_glyphs_diffs = False
 
-    to_designspace_axes = to_designspace_axes
+    def to_designspace_axes(self):
+        glyphsLib.builder.axes.to_designspace_axes(self)
 
 
 def gsAxesToDesignSpaceAxes(gsFont):
@@ -1466,7 +3402,7 @@ def gsLocalAxesToFontraLocalAxes(gsGlyph):
             minValue=axis.bottomValue,
             defaultValue=(
                 axis.bottomValue
-                if basePoleMapping[axis.name] == Pole.MIN
+                if basePoleMapping[axis.name] == smartComponents.Pole.MIN
                 else axis.topValue
             ),
             maxValue=axis.topValue,
@@ -1651,9 +3587,9 @@ def setupPoleMapping(glyphAxes, location):
                 "Intermediate layers within smart glyphs are not yet implemented"
             )
         pole = (
-            int(Pole.MIN)  # convert to int for Python <= 3.10
+            int(smartComponents.Pole.MIN)  # convert to int for Python <= 3.10
             if axis.minValue == axisValue
-            else int(Pole.MAX)  # convert to int for Python <= 3.10
+            else int(smartComponents.Pole.MAX)  # convert to int for Python <= 3.10
         )
         # Set pole, only MIN or MAX possible.
         # NOTE: In GlyphsApp these are checkboxes, either: on or off.
@@ -1691,7 +3627,7 @@ def fontraComponentToGSComponent(component):
         )
     gsComponent = glyphsLib.classes.GSComponent(component.name)
     transformation = component.transformation.toTransform()
-    gsComponent.transform = GSTransform(*transformation)
+    gsComponent.transform = glyphsLib.types.Transform(*transformation)
     for axisName in component.location:
         gsComponent.smartComponentValues[axisName] = component.location[axisName]
 
@@ -1725,21 +3661,265 @@ def fontraGuidelineToGSGuide(guideline):
     return gsGuide
 
 
+# The functions below produce raw (format 3) glyph data the way glyphsLib would
+# write it, and openstep_plist would parse it again. glyphsLib writes floats with
+# at most five decimals (three for points), and sorts the keys of plain dicts.
+
+# Glyph keys that glyphsLib writes back as they were read: the ones it writes if
+# they're not None, and the ones it writes if they're true-ish
+rawGlyphKeysIfNotNone = {
+    "case",
+    "category",
+    "color",
+    "glyphname",
+    "lastChange",
+    "note",
+    "script",
+    "subCategory",
+}
+rawGlyphKeysIfTrue = {
+    "kernLeft",
+    "kernRight",
+    "locked",
+    "metricLeft",
+    "metricRight",
+    "metricWidth",
+    "production",
+    "tags",
+    "userData",
+}
+# Glyph keys that are dropped by glyphsLib (the vertical kerning groups are added
+# back by _updateKerningSidesForGlyph()), or rebuilt from the VariableGlyph
+rawGlyphKeysNotCopied = {"kernBottom", "kernTop", "layers", "unicode"}
+
+# Layer keys that glyphsLib writes back as they were read, if they're not None
+rawLayerKeysIfNotNone = {
+    "color",
+    "metricLeft",
+    "metricRight",
+    "metricWidth",
+    "vertOrigin",
+    "vertWidth",
+}
+# Layer keys that are rebuilt from the VariableGlyph, or from the layer info
+rawLayerKeysRebuilt = {
+    "anchors",
+    "associatedMasterId",
+    "background",
+    "guides",
+    "layerId",
+    "name",
+    "shapes",
+    "userData",
+    "visible",
+    "width",
+}
+
+rawNodeTypeCodes = {
+    None: "o",
+    "move": "l",
+    "line": "l",
+    "curve": "c",
+    "qcurve": "q",
+}
+
+
+def canWriteRawGlyph(rawGlyphData):
+    knownGlyphKeys = (
+        rawGlyphKeysIfNotNone | rawGlyphKeysIfTrue | rawGlyphKeysNotCopied | {"export"}
+    )
+    if not knownGlyphKeys.issuperset(rawGlyphData):
+        return False
+
+    if not rawGlyphData.get("lastChange", " +0000").endswith(" +0000"):
+        # glyphsLib would convert the time to UTC
+        return False
+
+    knownLayerKeys = rawLayerKeysIfNotNone | rawLayerKeysRebuilt
+    for rawLayer in rawGlyphData.get("layers", ()):
+        if "layerId" not in rawLayer or not knownLayerKeys.issuperset(rawLayer):
+            return False
+        if not knownLayerKeys.issuperset(rawLayer.get("background", ())):
+            return False
+
+    return True
+
+
+def isWrittenRawGlyphValue(key, value):
+    if key in rawGlyphKeysIfNotNone:
+        return True
+    if key in rawGlyphKeysIfTrue:
+        return bool(value)
+    if key == "export":
+        return not value
+    return False
+
+
+def copyRawLayer(rawLayer):
+    # Copy the layer data that isn't replaced by _fontraLayerToRawLayer()
+    return {
+        key: copyRawLayer(value) if key == "background" else normalizeRawValue(value)
+        for key, value in rawLayer.items()
+        if key not in {"anchors", "guides", "shapes"}
+    }
+
+
+def sortRawLayerKeys(rawLayer, isBackgroundLayer):
+    # glyphsLib writes the layer keys in alphabetical order, and skips some
+    sortedLayer = {key: rawLayer[key] for key in sorted(rawLayer)}
+
+    for key in ["anchors", "guides", "layerId", "name", "shapes", "userData"]:
+        if not sortedLayer.get(key):
+            sortedLayer.pop(key, None)
+    if not sortedLayer.get("visible"):
+        sortedLayer.pop("visible", None)
+
+    isMasterLayer = rawLayer.get("layerId") == rawLayer.get("associatedMasterId")
+    if isBackgroundLayer or isMasterLayer:
+        sortedLayer.pop("associatedMasterId", None)
+        sortedLayer.pop("name", None)
+    if isBackgroundLayer:
+        sortedLayer.pop("width", None)
+
+    if "background" in sortedLayer:
+        sortedLayer["background"] = sortRawLayerKeys(sortedLayer["background"], True)
+    if "userData" in sortedLayer:
+        sortedLayer["userData"] = normalizeRawValue(sortedLayer["userData"])
+
+    return sortedLayer
+
+
+def normalizeRawValue(value):
+    if isinstance(value, dict):
+        return {key: normalizeRawValue(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        return [normalizeRawValue(item) for item in value]
+    if isinstance(value, bool):
+        return int(value)
+    return roundRawNumber(value, 5)
+
+
+def gsValueToRawValue(value):
+    # The equivalent of writing a plain value with glyphsLib's Writer and parsing
+    # it again: the Writer sorts dict keys, except for OrderedDicts
+    if isinstance(value, dict):
+        keys = value if isinstance(value, OrderedDict) else sorted(value)
+        return {
+            key: gsValueToRawValue(value[key]) for key in keys if value[key] is not None
+        }
+    if isinstance(value, list):
+        return [gsValueToRawValue(item) for item in value]
+    return normalizeRawValue(value)
+
+
+def setRawFontDataValue(rawFontData, key, value):
+    # Set or delete (if value is None) a raw font data value. glyphsLib writes the
+    # font keys in sorted order, a new key is inserted accordingly.
+    if value is None:
+        rawFontData.pop(key, None)
+    elif key in rawFontData:
+        rawFontData[key] = value
+    else:
+        items = list(rawFontData.items())
+        index = next(
+            (i for i, (otherKey, _) in enumerate(items) if otherKey > key),
+            len(items),
+        )
+        items.insert(index, (key, value))
+        rawFontData.clear()
+        rawFontData.update(items)
+
+
+def roundRawNumber(value, numDigits):
+    if not isinstance(value, float):
+        return value
+    value = round(value, numDigits)
+    return int(value) if value.is_integer() else value
+
+
+class RawPathPointPen:
+    # The equivalent of drawing into glyphsLib's LayerPointPen, and writing
+    # the resulting GSPaths. Only paths are drawn into it: a Fontra path has no
+    # components, those are converted separately, see _fontraLayerToRawLayer()
+    def __init__(self):
+        self.rawPaths = []
+        self._nodes = None
+        self._isClosed = True
+
+    def beginPath(self, **kwargs):
+        self._nodes = []
+        self._isClosed = True
+
+    def addPoint(
+        self, pt, segmentType=None, smooth=False, name=None, userData=None, **kwargs
+    ):
+        if segmentType == "move":
+            self._isClosed = False
+
+        nodeType = rawNodeTypeCodes[segmentType]
+        if smooth:
+            nodeType += "s"
+        node = [roundRawNumber(pt[0], 5), roundRawNumber(pt[1], 5), nodeType]
+
+        # The userData replaces the name, like in LayerPointPen
+        nodeData = userData or ({"name": name} if name is not None else None)
+        if nodeData:
+            node.append(normalizeRawValue(nodeData))
+        self._nodes.append(node)
+
+    def endPath(self):
+        nodes = self._nodes
+        if self._isClosed and nodes:
+            # Glyphs stores the starting node of a closed contour at the end
+            nodes.append(nodes.pop(0))
+        rawPath = {"closed": int(self._isClosed)}
+        if nodes:
+            rawPath["nodes"] = nodes
+        self.rawPaths.append(rawPath)
+        self._nodes = None
+
+
+def fontraAnchorToRawAnchor(anchor):
+    rawAnchor = {}
+    if anchor.name:
+        rawAnchor["name"] = anchor.name
+    rawAnchor["pos"] = [roundRawNumber(anchor.x, 3), roundRawNumber(anchor.y, 3)]
+    if anchor.customData:
+        rawAnchor["userData"] = normalizeRawValue(anchor.customData)
+    return rawAnchor
+
+
+def fontraGuidelineToRawGuide(guideline):
+    rawGuide = {}
+    if guideline.angle:
+        rawGuide["angle"] = normalizeRawValue(guideline.angle)
+    if guideline.locked:
+        rawGuide["locked"] = 1
+    if guideline.name:
+        rawGuide["name"] = guideline.name
+    if guideline.x or guideline.y:
+        rawGuide["pos"] = [
+            roundRawNumber(guideline.x, 3),
+            roundRawNumber(guideline.y, 3),
+        ]
+    return rawGuide
+
+
 def canParseFeatures(featureText, glyphNames):
     featureFile = io.StringIO(featureText)
 
     try:
-        fea_parser = FeatureParser(
+        fea_parser = feaLibParser.Parser(
             featureFile,
             glyphNames=glyphNames,
             includeDir=None,
         )
-    except IncludedFeaNotFound:
+    except feaLibError.IncludedFeaNotFound:
         return False
 
     try:
         _ = fea_parser.parse()
-    except FeatureLibError:
+    except feaLibError.FeatureLibError:
         return False
 
     return True
@@ -1767,14 +3947,14 @@ expandedFeaturesWarning = """\
 def expensiveGetFeatures(path):
     gsFont = glyphsLib.classes.GSFont(path)
 
-    defaultMasterID = get_regular_master(gsFont).id
+    defaultMasterID = glyphsLib.builder.axes.get_regular_master(gsFont).id
     try:
         featureText = glyphsLib.builder.features._to_ufo_features(
             gsFont,
             master=gsFont.masters[defaultMasterID],
             expand_includes=True,
         )
-    except FeatureLibError:
+    except feaLibError.FeatureLibError:
         return None
 
     return expandedFeaturesWarning + featureText
@@ -1792,5 +3972,22 @@ def includeGroup(glyphNames, excludeGlyphs):
     return not any(gn in excludeGlyphs for gn in glyphNames)
 
 
+def copyKerning(kerning):
+    return replace(
+        kerning,
+        groupsSide1={
+            name: list(glyphs) for name, glyphs in kerning.groupsSide1.items()
+        },
+        groupsSide2={
+            name: list(glyphs) for name, glyphs in kerning.groupsSide2.items()
+        },
+        sourceIdentifiers=list(kerning.sourceIdentifiers),
+        values={
+            left: {right: list(values) for right, values in rightDict.items()}
+            for left, rightDict in kerning.values.items()
+        },
+    )
+
+
 def hasKerning(kerning):
     return bool(kerning.values or kerning.groupsSide1 or kerning.groupsSide2)
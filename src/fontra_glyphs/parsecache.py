@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+from typing import Any
+
+import openstep_plist
+
+from .utils import glyphTextDigest
+
+logger = logging.getLogger(__name__)
+
+
+# Bump this when the structure of the cached data changes
+parseCacheFormatVersion = 3
+
+
+class ParseCache:
+    """A persistent cache of parsed plist files, stored as a single pickle file
+    per font in `cacheDir`.
+
+    Each source file has its own entry. An entry is valid if the file has the same
+    size and modification time as when it was parsed, or else if its content hash
+    is the same. The content hash is the glyphTextDigest() of the file, so a
+    loader that already has it doesn't need to read the file again, see put().
+    Derived data (for example the glyph map) can be stored along with the
+    entries, and is only valid if all entries used were valid.
+    """
+
+    def __init__(self, cacheDir: os.PathLike, fontPath: os.PathLike) -> None:
+        self.fontPath = pathlib.Path(fontPath).resolve()
+        pathHash = hashlib.sha1(os.fsencode(self.fontPath)).hexdigest()
+        self.cachePath = (
+            pathlib.Path(cacheDir) / f"{self.fontPath.name}-{pathHash}.pickle"
+        )
+        self.entries: dict[str, tuple] = {}
+        self.derivedData: dict[str, Any] = {}
+        self.updatedDerivedKeys: set[str] = set()
+        self.usedKeys: set[str] = set()
+        self.hadMisses = False
+        self.isDirty = False
+        self._read()
+
+    def _read(self) -> None:
+        try:
+            with open(self.cachePath, "rb") as fp:
+                snapshot = pickle.load(fp)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"ignoring unreadable parse cache {self.cachePath}: {e!r}")
+            return
+
+        if snapshot.get("formatVersion") != parseCacheFormatVersion or snapshot.get(
+            "fontPath"
+        ) != os.fspath(self.fontPath):
+            return
+
+        self.entries = snapshot["entries"]
+        self.derivedData = snapshot["derivedData"]
+
+    def _entryKey(self, path: os.PathLike) -> str:
+        return os.path.relpath(path, self.fontPath)
+
+    def get(self, path: os.PathLike) -> Any | None:
+        key = self._entryKey(path)
+        self.usedKeys.add(key)
+        entry = self.entries.get(key)
+        if entry is not None:
+            size, mtime, digest, obj = entry
+            stat = os.stat(path)
+            if getStatKey(stat) == (size, mtime):
+                return obj
+            if stat.st_size == size and glyphTextDigest(readData(path)) == digest:
+                # The file was touched, but not changed
+                self.entries[key] = (size, stat.st_mtime_ns, digest, obj)
+                self.isDirty = True
+                return obj
+        self.hadMisses = True
+        return None
+
+    def put(
+        self, path: os.PathLike, obj: Any, statBefore: os.stat_result, digest: str
+    ) -> None:
+        """Store `obj` as the parsed data for `path`, which was read after
+        `statBefore` was taken, and has the glyphTextDigest() `digest`. If the
+        file changed since, `obj` is not stored.
+        """
+        if getStatKey(os.stat(path)) != getStatKey(statBefore):
+            return
+        self._putEntry(path, obj, statBefore, digest)
+
+    def _putEntry(self, path, obj, stat, digest) -> None:
+        key = self._entryKey(path)
+        self.usedKeys.add(key)
+        self.entries[key] = (*getStatKey(stat), digest, obj)
+        self.hadMisses = True
+        self.isDirty = True
+
+    def openstepPlistFromPath(self, path: os.PathLike) -> Any:
+        obj = self.get(path)
+        if obj is None:
+            stat = os.stat(path)
+            data = readData(path)
+            obj = openstep_plist.loads(data.decode("utf-8"), use_numbers=True)
+            self._putEntry(path, obj, stat, glyphTextDigest(data))
+        return obj
+
+    def getDerivedData(self, key: str) -> Any | None:
+        if self.hadMisses or self.usedKeys != set(self.entries):
+            # A file was changed, added or removed
+            return None
+        return self.derivedData.get(key)
+
+    def setDerivedData(self, key: str, value: Any) -> None:
+        self.derivedData[key] = value
+        self.updatedDerivedKeys.add(key)
+        self.isDirty = True
+
+    def save(self) -> None:
+        # Forget about files that no longer exist
+        unusedKeys = set(self.entries) - self.usedKeys
+        for key in unusedKeys:
+            del self.entries[key]
+
+        if not self.isDirty and not unusedKeys:
+            return
+
+        if self.hadMisses or unusedKeys:
+            # Derived data that wasn't updated is now invalid
+            self.derivedData = {
+                key: value
+                for key, value in self.derivedData.items()
+                if key in self.updatedDerivedKeys
+            }
+
+        snapshot = dict(
+            formatVersion=parseCacheFormatVersion,
+            fontPath=os.fspath(self.fontPath),
+            entries=self.entries,
+            derivedData=self.derivedData,
+        )
+        self.cachePath.parent.mkdir(parents=True, exist_ok=True)
+        tempPath = self.cachePath.with_suffix(".tmp")
+        try:
+            with open(tempPath, "wb") as fp:
+                pickle.dump(snapshot, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempPath, self.cachePath)
+        except OSError as e:
+            logger.warning(f"can't write parse cache {self.cachePath}: {e!r}")
+        self.isDirty = False
+
+
+def getStatKey(stat: os.stat_result) -> tuple[int, int]:
+    return stat.st_size, stat.st_mtime_ns
+
+
+def readData(path: os.PathLike) -> bytes:
+    with open(path, "rb") as fp:
+        return fp.read()
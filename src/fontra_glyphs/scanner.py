@@ -0,0 +1,197 @@
+import re
+
+import openstep_plist
+
+# The top-level glyph keys we need before a glyph is fully parsed: the glyph
+# name, code points, infos and kerning groups (Glyphs 2 and Glyphs 3 key names)
+glyphHeaderKeys = frozenset(
+    [
+        "glyphname",
+        "unicode",
+        "category",
+        "subCategory",
+        "kernLeft",
+        "kernRight",
+        "kernTop",
+        "kernBottom",
+        "leftKerningGroup",
+        "rightKerningGroup",
+        "topKerningGroup",
+        "bottomKerningGroup",
+    ]
+)
+
+
+class GlyphsScanError(Exception):
+    pass
+
+
+class UnparsedGlyphData(dict):
+    """A glyph record that has not been parsed yet. The dict contains only the
+    header keys (see `glyphHeaderKeys`), `text` contains the plist source of
+    the complete glyph record.
+    """
+
+    __slots__ = ["text"]
+
+    def __init__(self, header, text: bytes) -> None:
+        super().__init__(header)
+        self.text = text
+
+    @classmethod
+    def fromText(cls, text: bytes) -> "UnparsedGlyphData":
+        header, _ = scanGlyphRecord(text)
+        return cls(header, text)
+
+    def parse(self) -> dict:
+        return openstep_plist.loads(self.text.decode("utf-8"), use_numbers=True)
+
+    def __eq__(self, other):
+        if isinstance(other, UnparsedGlyphData):
+            return self.text == other.text
+        if isinstance(other, dict):
+            return self.parse() == other
+        return NotImplemented
+
+    def __ne__(self, other):
+        isEqual = self.__eq__(other)
+        return isEqual if isEqual is NotImplemented else not isEqual
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self)!r}, <{len(self.text)} bytes>)"
+
+
+# OpenStep plist tokens that matter for finding the end of a (nested) dict. We
+# can ignore parens: they are balanced within a dict. Unquoted strings and
+# <hex data> can't contain any of these characters. Comments are not supported,
+# .glyphs files don't contain them.
+_braceOrQuotePattern = re.compile(rb'[{}"]')
+_braceParenOrQuotePattern = re.compile(rb'[{}("]')
+_stringEndPattern = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_nonWhitespacePattern = re.compile(rb"[^\s,]")
+_glyphsKeyPattern = re.compile(rb'(?:^|[\s;{])"?glyphs"?\s*=\s*\Z')
+
+
+def scanGlyphsFile(
+    data: bytes, scanHeaders: bool = True
+) -> tuple[bytes, list[tuple[int, int, dict | None]]]:
+    """Find the glyph records in the top-level "glyphs" list of a .glyphs file.
+
+    Return a tuple: (fontData, glyphRecords). `fontData` is the file data with an
+    empty "glyphs" list. `glyphRecords` contains a (start, end, header) tuple for
+    each glyph record, so that `data[start:end]` is the plist source of the glyph
+    record, and `header` is a dict with its header keys. If `scanHeaders` is
+    False, only the extent of the glyph records is found, and `header` is None.
+    """
+    listStart = _findGlyphsList(data)
+    if listStart is None:
+        return data, []
+
+    glyphRecords = []
+    pos = listStart
+    while True:
+        match = _nonWhitespacePattern.search(data, pos)
+        if match is None:
+            raise GlyphsScanError("unterminated glyphs list")
+        char = match.group()
+        start = match.start()
+        if char == b")":
+            listEnd = start
+            break
+        if char != b"{":
+            raise GlyphsScanError(f"unexpected glyph record at position {start}")
+        if scanHeaders:
+            header, end = scanGlyphRecord(data, start)
+        else:
+            header, end = None, findDictEnd(data, start)
+        glyphRecords.append((start, end, header))
+        pos = end
+
+    return data[:listStart] + data[listEnd:], glyphRecords
+
+
+def _findGlyphsList(data: bytes) -> int | None:
+    # Return the position right after the opening paren of the top-level
+    # "glyphs" list, or None if there is no glyphs list
+    depth = 0
+    pos = 0
+    while True:
+        match = _braceParenOrQuotePattern.search(data, pos)
+        if match is None:
+            return None
+        char = match.group()
+        pos = match.end()
+        if char == b'"':
+            pos = skipString(data, pos)
+        elif char == b"{":
+            depth += 1
+        elif char == b"}":
+            depth -= 1
+            if not depth:
+                return None
+        elif depth == 1 and _glyphsKeyPattern.search(
+            data, max(0, match.start() - 64), match.start()
+        ):
+            return pos
+
+
+def scanGlyphRecord(data: bytes, start: int = 0) -> tuple[dict, int]:
+    """Return the header keys of the glyph record starting at `start`, and the
+    position right after the record. The layers and other nested dicts are not
+    parsed: they get replaced with a placeholder before parsing the rest.
+    """
+    assert data[start : start + 1] == b"{"
+    skeleton = []
+    pos = last = start + 1
+    while True:
+        match = _braceOrQuotePattern.search(data, pos)
+        if match is None:
+            raise GlyphsScanError(f"unterminated glyph record at position {start}")
+        char = match.group()
+        pos = match.end()
+        if char == b'"':
+            pos = skipString(data, pos)
+        elif char == b"{":
+            skeleton.append(data[last : match.start()])
+            skeleton.append(b"0")
+            pos = last = findDictEnd(data, match.start())
+        else:
+            skeleton.append(data[last:pos])
+            break
+
+    skeletonText = b"{" + b"".join(skeleton)
+    record = openstep_plist.loads(skeletonText.decode("utf-8"), use_numbers=True)
+    header = {key: value for key, value in record.items() if key in glyphHeaderKeys}
+    return header, pos
+
+
+def findDictEnd(data: bytes, start: int) -> int:
+    """Given the position of an opening brace, return the position right after
+    the matching closing brace.
+    """
+    assert data[start : start + 1] == b"{"
+    depth = 0
+    pos = start
+    while True:
+        closePos = data.find(b"}", pos)
+        if closePos < 0:
+            raise GlyphsScanError(f"unterminated dict at position {start}")
+        quotePos = data.find(b'"', pos, closePos)
+        if quotePos < 0:
+            # Fast path: no strings up to the next closing brace
+            depth += data.count(b"{", pos, closePos) - 1
+            pos = closePos + 1
+            if not depth:
+                return pos
+        else:
+            depth += data.count(b"{", pos, quotePos)
+            pos = skipString(data, quotePos + 1)
+
+
+def skipString(data: bytes, pos: int) -> int:
+    # pos is right after the opening quote, return the position right after
+    # the closing quote
+    match = _stringEndPattern.match(data, pos)
+    if match is None:
+        raise GlyphsScanError(f"unterminated string at position {pos}")
+    return match.end()
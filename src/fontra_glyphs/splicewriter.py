@@ -0,0 +1,168 @@
+import os
+import uuid
+
+from .utils import (
+    convertMatchesToTuples,
+    matchTreeFont,
+    openstepPlistDumps,
+    openstepPlistDumpsGlyph,
+)
+
+
+class SpliceWriter:
+    """Holds the serialized bytes of a .glyphs file, together with the byte range
+    of each glyph record in the "glyphs" list. This allows us to replace, insert
+    or delete a single glyph record without re-serializing the entire font. The
+    result is byte-identical to a full write with `openstepPlistDumps()`.
+
+    Glyph records are separated by ",\\n", the span of a record excludes the
+    separator.
+    """
+
+    def __init__(
+        self,
+        data: bytearray,
+        glyphsListStart: int,
+        glyphNames: list[str],
+        glyphSpans: list[list[int]],
+    ) -> None:
+        self.data = data
+        self.glyphsListStart = glyphsListStart
+        self.glyphNames = glyphNames
+        self.glyphSpans = glyphSpans
+        self._dirtyStart: int | None = 0
+        self._sizeChanged = True
+        self._fileStat: tuple[int, int] | None = None
+
+    @classmethod
+    def fromRawData(cls, rawFontData, rawGlyphsData) -> "SpliceWriter":
+        head, tail = dumpsRawFontDataWithoutGlyphs(rawFontData)
+
+        data = bytearray(head)
+        glyphsListStart = len(data)
+        glyphNames = []
+        glyphSpans = []
+
+        for glyphData in rawGlyphsData:
+            if glyphSpans:
+                data += b",\n"
+            start = len(data)
+            data += encodeGlyphText(openstepPlistDumpsGlyph(glyphData))
+            glyphNames.append(glyphData["glyphname"])
+            glyphSpans.append([start, len(data)])
+
+        # The marker line took care of the newline between the last glyph and the
+        # closing paren, but there is only a single newline if the list is empty
+        data += tail if glyphSpans else tail[1:]
+
+        return cls(data, glyphsListStart, glyphNames, glyphSpans)
+
+    def replaceGlyph(self, glyphName: str, glyphText: str) -> None:
+        index = self.glyphNames.index(glyphName)
+        start, end = self.glyphSpans[index]
+        glyphData = encodeGlyphText(glyphText)
+        self._splice(start, end, glyphData, index + 1)
+        self.glyphSpans[index] = [start, start + len(glyphData)]
+
+    def insertGlyph(self, index: int, glyphName: str, glyphText: str) -> None:
+        glyphData = encodeGlyphText(glyphText)
+        numGlyphs = len(self.glyphNames)
+        assert 0 <= index <= numGlyphs
+
+        if not numGlyphs:
+            # The list was empty: we need to add the newline before the closing paren
+            position = start = self.glyphsListStart
+            self._splice(position, position, glyphData + b"\n", 0)
+        elif index < numGlyphs:
+            position = start = self.glyphSpans[index][0]
+            self._splice(position, position, glyphData + b",\n", index)
+        else:
+            position = self.glyphSpans[index - 1][1]
+            start = position + 2
+            self._splice(position, position, b",\n" + glyphData, index)
+
+        self.glyphNames.insert(index, glyphName)
+        self.glyphSpans.insert(index, [start, start + len(glyphData)])
+
+    def deleteGlyph(self, glyphName: str) -> None:
+        index = self.glyphNames.index(glyphName)
+        numGlyphs = len(self.glyphNames)
+
+        if numGlyphs == 1:
+            # The list becomes empty: remove the newline before the closing paren
+            start, end = self.glyphSpans[0][0], self.glyphSpans[0][1] + 1
+        elif index < numGlyphs - 1:
+            start, end = self.glyphSpans[index][0], self.glyphSpans[index + 1][0]
+        else:
+            start, end = self.glyphSpans[index - 1][1], self.glyphSpans[index][1]
+
+        self._splice(start, end, b"", index + 1)
+        del self.glyphNames[index]
+        del self.glyphSpans[index]
+
+    def _splice(self, start, end, newData, shiftFromIndex) -> None:
+        # Replace data[start:end] with newData, and move the spans of the glyph
+        # records that follow
+        self.data[start:end] = newData
+        sizeDelta = len(newData) - (end - start)
+        self._shiftSpans(shiftFromIndex, sizeDelta)
+        self._markDirty(start, bool(sizeDelta))
+
+    def _shiftSpans(self, fromIndex, sizeDelta) -> None:
+        if not sizeDelta:
+            return
+        for span in self.glyphSpans[fromIndex:]:
+            span[0] += sizeDelta
+            span[1] += sizeDelta
+
+    def _markDirty(self, start, sizeChanged) -> None:
+        self._dirtyStart = (
+            start if self._dirtyStart is None else min(start, self._dirtyStart)
+        )
+        self._sizeChanged = self._sizeChanged or sizeChanged
+
+    def write(self, path: os.PathLike) -> None:
+        """Write the data to path. If the file is as we left it last time, only
+        the bytes from the first change onwards are written.
+        """
+        if self._dirtyStart is None:
+            return
+
+        if self._dirtyStart == 0 or self._fileStat != getFileStat(path):
+            with open(path, "wb") as fp:
+                fp.write(self.data)
+        else:
+            with open(path, "r+b") as fp:
+                fp.seek(self._dirtyStart)
+                fp.write(self.data[self._dirtyStart :])
+                if self._sizeChanged:
+                    fp.truncate()
+
+        self._dirtyStart = None
+        self._sizeChanged = False
+        self._fileStat = getFileStat(path)
+
+
+def dumpsRawFontDataWithoutGlyphs(rawFontData) -> tuple[bytes, bytes]:
+    # Serialize the font data with a marker in place of the glyph records, and
+    # return the text before and after the marker
+    marker = "glyphs" + uuid.uuid4().hex
+    rawFontData = dict(rawFontData)
+    rawFontData["glyphs"] = [marker]
+    text = openstepPlistDumps(convertMatchesToTuples(rawFontData, matchTreeFont))
+    head, tail = text.split(f"\n{marker}\n")
+    return (head + "\n").encode("utf-8"), ("\n" + tail).encode("utf-8")
+
+
+def encodeGlyphText(glyphText: str) -> bytes:
+    # Strip the trailing newline, as the glyph record is a list item
+    assert glyphText.endswith("\n")
+    return glyphText[:-1].encode("utf-8")
+
+
+def getFileStat(path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
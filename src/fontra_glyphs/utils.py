@@ -1,12 +1,116 @@
+import hashlib
+import importlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import openstep_plist
 
 
+class LazyModule:
+    """Stands in for a module that is slow to import: the module is imported when
+    one of its attributes is first used.
+    """
+
+    def __init__(self, moduleName):
+        self._moduleName = moduleName
+        self._module = None
+
+    def __getattr__(self, name):
+        if self._module is None:
+            self._module = importlib.import_module(self._moduleName)
+        return getattr(self._module, name)
+
+
 def openstepPlistFromPath(path):
     with open(path, "r", encoding="utf-8") as fp:
         obj = openstep_plist.load(fp, use_numbers=True)
     return obj
 
 
+def glyphTextDigest(text: str | bytes) -> str:
+    """Return a digest of the plist text of a glyph record. Surrounding whitespace
+    is ignored, so a glyph record in a .glyphs file has the same digest as a
+    .glyph file with the same text.
+    """
+    if isinstance(text, str):
+        text = text.encode("utf-8")
+    return hashlib.sha256(text.strip()).hexdigest()
+
+
+def openstepPlistAndDigestFromPath(path):
+    with open(path, "rb") as fp:
+        data = fp.read()
+    obj = openstep_plist.loads(data.decode("utf-8"), use_numbers=True)
+    return obj, glyphTextDigest(data)
+
+
+parallelLoadingChunkSize = 200
+
+
+def openstepPlistsFromPathsParallel(paths, numWorkers):
+    """Read and parse many plist files, returning the parsed objects in the same
+    order as `paths`, and the glyphTextDigest() of each file. Files are read using
+    a pool of threads, and parsed in a pool of `numWorkers` processes, in chunks
+    of `parallelLoadingChunkSize` files.
+    """
+    pathChunks = [
+        paths[i : i + parallelLoadingChunkSize]
+        for i in range(0, len(paths), parallelLoadingChunkSize)
+    ]
+    # "spawn" is available on all platforms, and is safe to use from a
+    # multi-threaded process
+    mpContext = multiprocessing.get_context("spawn")
+    with (
+        ThreadPoolExecutor(numWorkers) as ioPool,
+        ProcessPoolExecutor(numWorkers, mp_context=mpContext) as parsePool,
+    ):
+        # ioPool.map() yields the chunks in order, as soon as they have been read,
+        # so parsing can start while other chunks are still being read
+        parseFutures = []
+        digests = []
+        for dataChunk in ioPool.map(readFiles, pathChunks):
+            parseFutures.append(parsePool.submit(openstepPlistsFromData, dataChunk))
+            # Like openstepPlistAndDigestFromPath(), digest the bytes as they are
+            # in the file
+            digests.extend(glyphTextDigest(data) for data in dataChunk)
+        objs = [obj for future in parseFutures for obj in future.result()]
+        return objs, digests
+
+
+def readFiles(paths):
+    dataChunk = []
+    for path in paths:
+        with open(path, "rb") as fp:
+            dataChunk.append(fp.read())
+    return dataChunk
+
+
+def openstepPlistsFromData(dataChunk):
+    return openstepPlistsFromTexts([data.decode("utf-8") for data in dataChunk])
+
+
+def openstepPlistsFromTexts(texts):
+    return [openstep_plist.loads(text, use_numbers=True) for text in texts]
+
+
+def openstepPlistsFromTextsParallel(texts, numWorkers):
+    """Parse many plist texts in a pool of `numWorkers` processes, in chunks of
+    `parallelLoadingChunkSize` texts, returning the parsed objects in the same
+    order as `texts`.
+    """
+    textChunks = [
+        texts[i : i + parallelLoadingChunkSize]
+        for i in range(0, len(texts), parallelLoadingChunkSize)
+    ]
+    mpContext = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(numWorkers, mp_context=mpContext) as parsePool:
+        return [
+            obj
+            for objs in parsePool.map(openstepPlistsFromTexts, textChunks)
+            for obj in objs
+        ]
+
+
 def openstepPlistDumps(rawData):
     return (
         openstep_plist.dumps(
@@ -23,6 +127,10 @@ def openstepPlistDumps(rawData):
     )
 
 
+def openstepPlistDumpsGlyph(rawGlyphData):
+    return openstepPlistDumps(convertMatchesToTuples(rawGlyphData, matchTreeGlyph))
+
+
 def getSourceFromLayerName(sources, layerName):
     for source in sources:
         if source.layerName == layerName:
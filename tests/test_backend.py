@@ -3,6 +3,9 @@ import os
 import pathlib
 import re
 import shutil
+import subprocess
+import sys
+import threading
 import uuid
 from contextlib import aclosing
 from copy import deepcopy
@@ -11,9 +14,11 @@ import glyphsLib
 import openstep_plist
 import pytest
 from fontra.backends import getFileSystemBackend
+from fontra.backends.filewatcher import Change
 from fontra.core.classes import (
     Anchor,
     Axes,
+    Component,
     FontInfo,
     GlyphAxis,
     GlyphSource,
@@ -29,7 +34,20 @@ from fontra.core.fonthandler import FontHandler
 from fontra.filesystem.projectmanager import FileSystemProjectManager
 from fontTools.ufoLib.filenames import userNameToFileName
 
-from fontra_glyphs.backend import GlyphsBackendError
+from fontra_glyphs.backend import (
+    GlyphsBackend,
+    GlyphsBackendError,
+    GlyphsPackageBackend,
+)
+from fontra_glyphs.scanner import UnparsedGlyphData
+from fontra_glyphs.utils import (
+    convertMatchesToTuples,
+    glyphTextDigest,
+    matchTreeFont,
+    openstepPlistAndDigestFromPath,
+    openstepPlistDumps,
+    openstepPlistFromPath,
+)
 
 dataDir = pathlib.Path(__file__).resolve().parent / "data"
 
@@ -117,6 +135,15 @@ def smartComponentsReferenceFont():
     return getFileSystemBackend(smartComponentsReferenceFontPath)
 
 
+@pytest.fixture(params=[glyphs2Path, glyphs3Path, glyphsPackagePath])
+def lazyTestFont(tmpdir, request):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(GlyphsBackend, "lazyLoading", True)
+        backend = _getCopiedBackend(request.param, tmpdir)
+    backend.lazyLoading = True
+    return backend
+
+
 expectedAxes = structure(
     {
         "axes": [
@@ -223,6 +250,23 @@ async def test_getGlyph(testFont, referenceFont, glyphName):
     assert referenceGlyph == glyph
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fontPath",
+    [glyphs3Path, glyphsPackagePath, fileFormatFontPath, smartComponentsFontPath],
+)
+async def test_getGlyph_rawConversion(fontPath):
+    font = getFileSystemBackend(fontPath)
+    numRawConversions = 0
+    for glyphName, glyphIndex in font.glyphNameToIndex.items():
+        rawGlyphData = font._getRawGlyphData(glyphIndex)
+        if font._getOrderedRawLayers(rawGlyphData) is not None:
+            numRawConversions += 1
+        glyph = await font.getGlyph(glyphName)
+        assert font._gsGlyphToVariableGlyph(glyphName) == glyph, glyphName
+    assert numRawConversions > 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("glyphName", list(expectedGlyphMap))
 async def test_putGlyph(writableTestFont, glyphName):
@@ -247,6 +291,36 @@ async def test_putGlyph(writableTestFont, glyphName):
     assert glyph == reopenedGlyph
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fontPath", [glyphs3Path, glyphsPackagePath, rtlFontPath])
+async def test_putGlyph_rawGlyphWriter(tmpdir, monkeypatch, fontPath):
+    # Compare the direct raw glyph writer with the glyphsLib round trip
+    monkeypatch.setattr(GlyphsBackend, "checkRawGlyphWriter", True)
+    font = _getCopiedBackend(fontPath, tmpdir)
+    glyphMap = await font.getGlyphMap()
+
+    numRawWrites = 0
+    for glyphName, codePoints in list(glyphMap.items()):
+        glyph = await font.getGlyph(glyphName)
+        for layer in glyph.layers.values():
+            layer.glyph.xAdvance += 0.123456
+            for i, coordinate in enumerate(layer.glyph.path.coordinates):
+                layer.glyph.path.coordinates[i] = coordinate + 0.1234567
+            layer.glyph.anchors.append(
+                Anchor(name="test", x=1.23456, y=-7.5, customData={"b": 2, "a": 1})
+            )
+            layer.glyph.guidelines.append(
+                Guideline(name="test", x=100.5, y=0, angle=45.0, locked=True)
+            )
+
+        if font._variableGlyphToRawGlyph(glyphName, glyph, codePoints, False):
+            numRawWrites += 1
+        await font.putGlyph(glyphName, glyph, codePoints)
+        await font.putGlyph(glyphName + ".copy", glyph, [])
+
+    assert numRawWrites > 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("gName", ["a", "A"])
 async def test_duplicateGlyph(writableTestFont, gName):
@@ -916,6 +990,22 @@ async def test_deleteGlyph(writableTestFont):
     assert glyph is None
 
 
+async def test_deleteGlyph_concurrent(writableTestFont):
+    glyphName = "A"
+
+    async with aclosing(writableTestFont):
+        # Deleting the same glyph twice at the same time deletes it once
+        await asyncio.gather(
+            writableTestFont.deleteGlyph(glyphName),
+            writableTestFont.deleteGlyph(glyphName),
+        )
+        assert glyphName not in await writableTestFont.getGlyphMap()
+
+    reopened = getFileSystemBackend(writableTestFont.path)
+    assert glyphName not in await reopened.getGlyphMap()
+    assert await reopened.getGlyph(glyphName) is None
+
+
 async def test_deleteGlyph_addGlyph(writableTestFont):
     # This test (ab)uses the fact that the glyphMap order reveals the
     # glyph order in the .glyphs or .glyphspackage file.
@@ -944,6 +1034,295 @@ async def test_deleteGlyph_addGlyph(writableTestFont):
     assert beforeKerning == afterKerning
 
 
+async def test_putGlyph_failedConversion(writableTestFont, monkeypatch):
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    glyph.name = "A.alt"
+
+    def failingConversion(*args):
+        raise ValueError("can't convert")
+
+    with monkeypatch.context() as m:
+        m.setattr(writableTestFont, "_variableGlyphToRawGlyph", failingConversion)
+        with pytest.raises(ValueError):
+            await writableTestFont.putGlyph("A.alt", glyph, [])
+
+    # The new glyph didn't get a slot
+    assert await writableTestFont.getGlyphMap() == glyphMap
+    assert await writableTestFont.getGlyph("A.alt") is None
+
+    await writableTestFont.putGlyph("A.alt", glyph, [])
+    assert await writableTestFont.getGlyph("A.alt") == glyph
+
+
+async def test_addAndDeleteManyGlyphs(writableTestFont):
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyphOrder = list(glyphMap)
+    glyph = await writableTestFont.getGlyph("A")
+
+    async with aclosing(writableTestFont):
+        newGlyphNames = [f"A.alt{i}" for i in range(20)]
+        for glyphName in newGlyphNames:
+            await writableTestFont.putGlyph(glyphName, glyph, [])
+        # Deleting more than half of the glyphs compacts the glyph list
+        for glyphName in newGlyphNames[:15] + glyphOrder[1::2]:
+            await writableTestFont.deleteGlyph(glyphName)
+        assert len(writableTestFont.rawGlyphsData) < len(glyphOrder) + 20
+        # A deleted glyph gets its original position back
+        await writableTestFont.putGlyph(glyphOrder[1], glyph, [])
+
+    expectedGlyphOrder = glyphOrder[:2] + glyphOrder[2::2] + newGlyphNames[15:]
+    reopened = getFileSystemBackend(writableTestFont.path)
+    assert list(await reopened.getGlyphMap()) == expectedGlyphOrder
+    for glyphName in writableTestFont.glyphNameToIndex:
+        assert await reopened.getGlyph(glyphName) == await writableTestFont.getGlyph(
+            glyphName
+        )
+
+
+async def test_putGlyphs(writableTestFont, monkeypatch):
+    writeCalls = []
+    writeChanges = writableTestFont._writeChanges
+
+    def recordingWriteChanges(*args):
+        writeCalls.append(args)
+        writeChanges(*args)
+
+    monkeypatch.setattr(writableTestFont, "_writeChanges", recordingWriteChanges)
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyphs = {}
+    for glyphName in ["A", "Adieresis", "a"]:
+        glyph = await writableTestFont.getGlyph(glyphName)
+        for layer in glyph.layers.values():
+            layer.glyph.xAdvance = 500
+        glyphs[glyphName] = (glyph, glyphMap[glyphName])
+    newGlyph = deepcopy(glyphs["A"][0])
+    newGlyph.name = "A.ss01"
+    glyphs["A.ss01"] = (newGlyph, [])
+
+    await writableTestFont.putGlyphs(glyphs)
+    assert len(writeCalls) == 1
+    assert writeCalls[0][1] == set(glyphs)
+
+    reopened = getFileSystemBackend(writableTestFont.path)
+    assert "A.ss01" in await reopened.getGlyphMap()
+    for glyphName, (glyph, codePoints) in glyphs.items():
+        assert await reopened.getGlyph(glyphName) == glyph
+
+
+async def test_spliceWriter_matches_fullWrite(tmpdir):
+    testFont = _getCopiedBackend(glyphs3Path, pathlib.Path(tmpdir))
+    glyphMap = await testFont.getGlyphMap()
+
+    async with aclosing(testFont):
+        # The first write is a full write, subsequent writes are spliced
+        for glyphName in ["A", "n", "A", "V"]:
+            glyph = await testFont.getGlyph(glyphName)
+            for layer in glyph.layers.values():
+                layer.glyph.xAdvance += 1234
+            await testFont.putGlyph(glyphName, glyph, glyphMap[glyphName])
+
+        glyph = await testFont.getGlyph("a")
+        glyph.name = "a.alt"
+        await testFont.putGlyph("a.alt", glyph, [])
+        await testFont.deleteGlyph("h")
+
+    splicedText = testFont.path.read_text()
+    root = openstep_plist.loads(splicedText, use_numbers=True)
+    assert splicedText == openstepPlistDumps(
+        convertMatchesToTuples(root, matchTreeFont)
+    )
+
+    reopened = getFileSystemBackend(testFont.path)
+    reopenedGlyph = await reopened.getGlyph("A")
+    assert reopenedGlyph == await testFont.getGlyph("A")
+    assert list(await reopened.getGlyphMap()) == list(await testFont.getGlyphMap())
+
+
+async def test_parallelLoading(monkeypatch):
+    sequentialFont = getFileSystemBackend(glyphsPackagePath)
+    monkeypatch.setattr(GlyphsPackageBackend, "loadingWorkers", 2)
+    parallelFont = getFileSystemBackend(glyphsPackagePath)
+
+    assert parallelFont.rawFontData == sequentialFont.rawFontData
+    assert parallelFont.rawGlyphsData == sequentialFont.rawGlyphsData
+    assert await parallelFont.getGlyphMap() == await sequentialFont.getGlyphMap()
+
+
+def test_parallelLoading_glyphDigests(tmpdir, monkeypatch):
+    fontPath = pathlib.Path(tmpdir) / glyphsPackagePath.name
+    shutil.copytree(glyphsPackagePath, fontPath)
+    # Windows line endings must not make the digests differ
+    glyphPath = fontPath / "glyphs" / "A_.glyph"
+    glyphPath.write_bytes(glyphPath.read_bytes().replace(b"\n", b"\r\n"))
+
+    sequentialFont = getFileSystemBackend(fontPath)
+    monkeypatch.setattr(GlyphsPackageBackend, "loadingWorkers", 2)
+    parallelFont = getFileSystemBackend(fontPath)
+
+    assert parallelFont.glyphDigests == sequentialFont.glyphDigests
+    assert parallelFont.getGlyphDigest("A") == glyphTextDigest(glyphPath.read_bytes())
+
+
+@pytest.mark.parametrize("loadingWorkers", [0, 2])
+async def test_parseCache(writableTestFont, tmpdir, monkeypatch, loadingWorkers):
+    monkeypatch.setattr(GlyphsBackend, "parseCacheDir", tmpdir / "cache")
+    monkeypatch.setattr(GlyphsPackageBackend, "loadingWorkers", loadingWorkers)
+    fontPath = writableTestFont.path
+
+    coldFont = getFileSystemBackend(fontPath)
+    assert coldFont.rawFontData == writableTestFont.rawFontData
+    assert coldFont.rawGlyphsData == writableTestFont.rawGlyphsData
+
+    cachedFont = getFileSystemBackend(fontPath)
+    assert cachedFont.rawFontData == writableTestFont.rawFontData
+    assert cachedFont.rawGlyphsData == writableTestFont.rawGlyphsData
+    assert await cachedFont.getGlyphMap() == await writableTestFont.getGlyphMap()
+    assert await cachedFont.getGlyphInfos() == await writableTestFont.getGlyphInfos()
+    assert await cachedFont.getKerning() == await writableTestFont.getKerning()
+    assert await cachedFont.getGlyph("A") == await writableTestFont.getGlyph("A")
+
+    glyphMap = await cachedFont.getGlyphMap()
+    glyph = await cachedFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+    async with aclosing(cachedFont):
+        await cachedFont.putGlyph("A", glyph, glyphMap["A"])
+        await cachedFont.deleteGlyph("dieresis")
+
+    reopened = getFileSystemBackend(fontPath)
+    assert await reopened.getGlyph("A") == glyph
+    assert "dieresis" not in await reopened.getGlyphMap()
+
+
+def getFontFileContents(fontPath):
+    if fontPath.is_dir():
+        return {path: path.read_bytes() for path in sorted(fontPath.rglob("*.*"))}
+    return fontPath.read_bytes()
+
+
+async def test_flushInterval(writableTestFont):
+    writableTestFont.flushInterval = 3600
+    fontPath = writableTestFont.path
+    contentsBefore = getFontFileContents(fontPath)
+
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    for xAdvance in [500, 510, 520]:
+        for layer in glyph.layers.values():
+            layer.glyph.xAdvance = xAdvance
+        await writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+
+    newGlyph = deepcopy(glyph)
+    newGlyph.name = "A.ss01"
+    await writableTestFont.putGlyph("A.ss01", newGlyph, [])
+    await writableTestFont.deleteGlyph("dieresis")
+    # Deleted and added again before the changes were written
+    await writableTestFont.deleteGlyph("a")
+    await writableTestFont.putGlyph("a", glyph, [ord("a")])
+    await writableTestFont.putKerning(await writableTestFont.getKerning())
+
+    assert getFontFileContents(fontPath) == contentsBefore
+    assert await writableTestFont.getGlyph("A") == glyph
+
+    await writableTestFont.flush()
+    assert getFontFileContents(fontPath) != contentsBefore
+
+    reopened = getFileSystemBackend(fontPath)
+    reopenedGlyphMap = await reopened.getGlyphMap()
+    assert list(reopenedGlyphMap) == [
+        glyphData["glyphname"]
+        for glyphData in writableTestFont._getRawGlyphsDataInFileOrder()
+    ]
+    assert await reopened.getGlyph("A") == glyph
+    assert await reopened.getGlyph("a") == await writableTestFont.getGlyph("a")
+    assert "A.ss01" in reopenedGlyphMap
+    assert "dieresis" not in reopenedGlyphMap
+
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 600
+    await writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+    await writableTestFont.aclose()
+
+    reopened = getFileSystemBackend(fontPath)
+    assert await reopened.getGlyph("A") == glyph
+
+
+async def test_flushInterval_rawFontData(writableTestFont):
+    writableTestFont.flushInterval = 3600
+    fontPath = writableTestFont.path
+    contentsBefore = getFontFileContents(fontPath)
+    rawFontDataBefore = deepcopy(writableTestFont.rawFontData)
+
+    kerning = await writableTestFont.getKerning()
+    kerning["kern"].values["@A"]["@J"][1] = 999
+    await writableTestFont.putKerning(kerning)
+
+    # The raw font data is updated right away, only the write is deferred
+    assert getFontFileContents(fontPath) == contentsBefore
+    rawFontData = deepcopy(writableTestFont.rawFontData)
+    assert rawFontData != rawFontDataBefore
+
+    await writableTestFont.flush()
+    assert getFontFileContents(fontPath) != contentsBefore
+    assert writableTestFont.rawFontData == rawFontData
+    await writableTestFont.aclose()
+
+
+async def test_flushInterval_background(writableTestFont):
+    writableTestFont.flushInterval = 0.01
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+
+    async with aclosing(writableTestFont):
+        await writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+        await asyncio.sleep(0.2)
+        reopened = getFileSystemBackend(writableTestFont.path)
+        assert await reopened.getGlyph("A") == glyph
+
+
+async def test_flushInterval_externalChanges(writableTestFont):
+    writableTestFont.flushInterval = 3600
+    fontPath = writableTestFont.path
+    externalFont = getFileSystemBackend(fontPath)
+
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+    await writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+    kerning = await writableTestFont.getKerning()
+    kerning["kern"].values["@A"]["@J"][1] = 999
+    await writableTestFont.putKerning(kerning)
+
+    # Another glyph is changed on disk before our changes are written
+    externalGlyph = await externalFont.getGlyph("a")
+    for layer in externalGlyph.layers.values():
+        layer.glyph.xAdvance = 700
+    await externalFont.putGlyph("a", externalGlyph, glyphMap["a"])
+
+    if isinstance(writableTestFont, GlyphsPackageBackend):
+        changedPath = writableTestFont.getGlyphFilePath("a")
+    else:
+        changedPath = fontPath
+    reloadPattern = await writableTestFont.fileWatcherProcessChanges(
+        {(Change.modified, str(changedPath))}
+    )
+    assert reloadPattern == {"glyphs": {"a": None}}
+    assert await writableTestFont.getGlyph("A") == glyph
+    assert await writableTestFont.getGlyph("a") == externalGlyph
+    assert await writableTestFont.getKerning() == kerning
+
+    await writableTestFont.aclose()
+
+    reopened = getFileSystemBackend(fontPath)
+    assert await reopened.getGlyph("A") == glyph
+    assert await reopened.getGlyph("a") == externalGlyph
+    assert await reopened.getKerning() == kerning
+
+
 async def test_writeFontData_glyphspackage_empty_glyphs_list(tmpdir):
     tmpdir = pathlib.Path(tmpdir)
     srcPath = pathlib.Path(glyphsPackagePath)
@@ -961,6 +1340,30 @@ async def test_writeFontData_glyphspackage_empty_glyphs_list(tmpdir):
     assert fontInfoAfter == fontInfoBefore
 
 
+async def test_writeFontData_keeps_other_font_data(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    srcPath = pathlib.Path(fileFormatFontPath)
+    dstPath = tmpdir / srcPath.name
+    shutil.copy(srcPath, dstPath)
+
+    testFont = getFileSystemBackend(dstPath)
+    async with aclosing(testFont):
+        kerning = await testFont.getKerning()
+        kerning["kern"].values["A"] = {
+            "A": [-50] * len(kerning["kern"].sourceIdentifiers)
+        }
+        await testFont.putKerning(kerning)
+        await testFont.putFeatures(await testFont.getFeatures())
+
+    rawFontDataBefore = openstep_plist.loads(srcPath.read_text(), use_numbers=True)
+    rawFontDataAfter = openstep_plist.loads(dstPath.read_text(), use_numbers=True)
+
+    assert list(rawFontDataAfter) == list(rawFontDataBefore)
+    assert rawFontDataAfter["kerningLTR"] != rawFontDataBefore["kerningLTR"]
+    for key in ["axes", "fontMaster", "instances", "glyphs"]:
+        assert rawFontDataAfter[key] == rawFontDataBefore[key], key
+
+
 @pytest.mark.parametrize(
     "glyphName, expectedUsedBy",
     [
@@ -977,6 +1380,382 @@ async def test_findGlyphsThatUseGlyph(testFont, glyphName, expectedUsedBy):
     assert usedBy == expectedUsedBy
 
 
+async def test_findGlyphsThatUseGlyph_updates(writableTestFont):
+    assert await writableTestFont.findGlyphsThatUseGlyph("A") == ["A-cy", "Adieresis"]
+
+    glyph = deepcopy(await writableTestFont.getGlyph("A-cy"))
+    glyph.name = "A-cy.alt"
+    await writableTestFont.putGlyph("A-cy.alt", glyph, [])
+    await writableTestFont.deleteGlyph("A-cy")
+    assert await writableTestFont.findGlyphsThatUseGlyph("A") == [
+        "A-cy.alt",
+        "Adieresis",
+    ]
+
+    # Components in layer backgrounds count, too
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("V")
+    layerName = glyph.sources[0].layerName
+    glyph.layers[layerName + "^background"] = Layer(
+        glyph=StaticGlyph(components=[Component(name="A")])
+    )
+    await writableTestFont.putGlyph("V", glyph, glyphMap["V"])
+    assert await writableTestFont.findGlyphsThatUseGlyph("A") == [
+        "A-cy.alt",
+        "Adieresis",
+        "V",
+    ]
+
+    reopened = getFileSystemBackend(writableTestFont.path)
+    assert await reopened.findGlyphsThatUseGlyph("A") == [
+        "A-cy.alt",
+        "Adieresis",
+        "V",
+    ]
+
+
+async def test_lazyLoading(lazyTestFont):
+    assert all(
+        isinstance(glyphData, UnparsedGlyphData)
+        for glyphData in lazyTestFont.rawGlyphsData
+    )
+
+    eagerFont = getFileSystemBackend(lazyTestFont.path)
+    assert not eagerFont.lazyLoading
+
+    glyphMap = await lazyTestFont.getGlyphMap()
+    assert glyphMap == await eagerFont.getGlyphMap()
+    assert await lazyTestFont.getGlyphInfos() == await eagerFont.getGlyphInfos()
+    assert await lazyTestFont.getKerning() == await eagerFont.getKerning()
+
+    await lazyTestFont.getGlyph("a")
+    unparsedGlyphNames = {
+        glyphData["glyphname"]
+        for glyphData in lazyTestFont.rawGlyphsData
+        if isinstance(glyphData, UnparsedGlyphData)
+    }
+    assert "a" not in unparsedGlyphNames
+    assert "A" in unparsedGlyphNames
+
+    for glyphName in glyphMap:
+        assert await lazyTestFont.getGlyph(glyphName) == await eagerFont.getGlyph(
+            glyphName
+        )
+
+
+async def test_lazyLoading_findGlyphsThatUseGlyph(lazyTestFont):
+    assert await lazyTestFont.findGlyphsThatUseGlyph("_part.shoulder") == [
+        "h",
+        "m",
+        "n",
+    ]
+    unparsedGlyphNames = {
+        glyphData["glyphname"]
+        for glyphData in lazyTestFont.rawGlyphsData
+        if isinstance(glyphData, UnparsedGlyphData)
+    }
+    assert "A" in unparsedGlyphNames
+
+
+async def test_lazyLoading_write(lazyTestFont):
+    glyphName = "A"
+    glyphMap = await lazyTestFont.getGlyphMap()
+    kerning = await lazyTestFont.getKerning()
+    glyph = await lazyTestFont.getGlyph(glyphName)
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+
+    async with aclosing(lazyTestFont):
+        await lazyTestFont.putGlyph(glyphName, glyph, glyphMap[glyphName])
+        await lazyTestFont.deleteGlyph("dieresis")
+
+    reopened = getFileSystemBackend(lazyTestFont.path)
+    assert await reopened.getGlyph(glyphName) == glyph
+    assert "dieresis" not in await reopened.getGlyphMap()
+    assert await reopened.getKerning() == kerning
+
+
+@pytest.mark.parametrize("path", [glyphs3Path, glyphsPackagePath])
+async def test_backgroundLoading(path, monkeypatch):
+    eagerFont = getFileSystemBackend(path)
+    monkeypatch.setattr(GlyphsBackend, "backgroundLoading", True)
+    monkeypatch.setattr(GlyphsBackend, "backgroundLoadingChunkSize", 4)
+    testFont = getFileSystemBackend(path)
+    assert all(
+        isinstance(glyphData, UnparsedGlyphData) for glyphData in testFont.rawGlyphsData
+    )
+
+    glyphMap = await testFont.getGlyphMap()
+    assert glyphMap == await eagerFont.getGlyphMap()
+    assert await testFont.getAxes() == await eagerFont.getAxes()
+    assert await testFont.getGlyph("A") == await eagerFont.getGlyph("A")
+
+    async with aclosing(testFont):
+        await testFont.waitForBackgroundLoading()
+        assert not any(
+            isinstance(glyphData, UnparsedGlyphData)
+            for glyphData in testFont.rawGlyphsData
+        )
+        for glyphName in glyphMap:
+            assert await testFont.getGlyph(glyphName) == await eagerFont.getGlyph(
+                glyphName
+            )
+
+
+async def test_maxParsedGlyphs(monkeypatch):
+    referenceFont = getFileSystemBackend(glyphs2Path)
+    monkeypatch.setattr(GlyphsBackend, "maxParsedGlyphs", 3)
+    testFont = getFileSystemBackend(glyphs2Path)
+
+    glyphMap = await testFont.getGlyphMap()
+    for glyphName in glyphMap:
+        assert await testFont.getGlyph(glyphName) == await referenceFont.getGlyph(
+            glyphName
+        )
+        assert len(testFont.parsedGlyphs) <= 3
+
+    assert testFont.parsedGlyphCounters["evictions"] > 0
+
+    # A glyph and its components stay parsed while the glyph is used
+    await testFont.getGlyph("Adieresis")
+    hits = testFont.parsedGlyphCounters["hits"]
+    await testFont.getGlyph("Adieresis")
+    assert testFont.parsedGlyphCounters["hits"] == hits + 3
+    assert list(testFont.parsedGlyphs)[-3:] == ["Adieresis", "A", "dieresis"]
+
+
+async def test_glyphCache(tmpdir, monkeypatch):
+    monkeypatch.setattr(GlyphsBackend, "glyphCacheMaxBytes", 50_000)
+    testFont = _getCopiedBackend(glyphs3Path, tmpdir)
+    glyphMap = await testFont.getGlyphMap()
+    counters = testFont.glyphCache.counters
+
+    glyph = await testFont.getGlyph("A")
+    assert counters == {"hits": 0, "misses": 1, "evictions": 0}
+
+    # Changing the result doesn't change the cached glyph
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+    assert await testFont.getGlyph("A") != glyph
+    assert counters["hits"] == 1
+
+    await testFont.putGlyph("A", glyph, glyphMap["A"])
+    assert "A" not in testFont.glyphCache.glyphs
+    assert await testFont.getGlyph("A") == glyph
+
+    for glyphName in glyphMap:
+        await testFont.getGlyph(glyphName)
+    assert counters["evictions"] > 0
+    assert testFont.glyphCache.numBytes <= 50_000
+
+    await testFont.deleteGlyph(glyphName)
+    assert glyphName not in testFont.glyphCache.glyphs
+    assert await testFont.getGlyph(glyphName) is None
+
+
+async def test_getGlyphs(testFont):
+    glyphMap = await testFont.getGlyphMap()
+    glyphNames = ["Adieresis", "A", "nonexistent", *glyphMap]
+
+    glyphs = {}
+    async for glyphName, glyph in testFont.getGlyphs(glyphNames):
+        assert glyphName not in glyphs
+        glyphs[glyphName] = glyph
+
+    assert glyphs.keys() == set(glyphNames)
+    assert glyphs["nonexistent"] is None
+    for glyphName in glyphMap:
+        assert glyphs[glyphName] == await testFont.getGlyph(glyphName)
+
+
+async def test_getGlyphs_lazyLoading(lazyTestFont, monkeypatch):
+    monkeypatch.setattr(lazyTestFont, "glyphBatchWorkers", 2)
+    monkeypatch.setattr("fontra_glyphs.backend.parallelLoadingChunkSize", 4)
+    monkeypatch.setattr("fontra_glyphs.utils.parallelLoadingChunkSize", 4)
+    eagerFont = getFileSystemBackend(lazyTestFont.path)
+
+    async for glyphName, glyph in lazyTestFont.getGlyphs(["Adieresis", "m"]):
+        assert glyph == await eagerFont.getGlyph(glyphName)
+
+    unparsedGlyphNames = {
+        glyphData["glyphname"]
+        for glyphData in lazyTestFont.rawGlyphsData
+        if isinstance(glyphData, UnparsedGlyphData)
+    }
+    # The components were parsed along with the glyphs
+    assert not unparsedGlyphNames & {"Adieresis", "A", "dieresis", "m"}
+    assert unparsedGlyphNames
+
+
+async def test_getGlyph_offEventLoop(writableTestFont, monkeypatch):
+    threadNames = set()
+    getGlyph = writableTestFont._getGlyph
+
+    def recordingGetGlyph(glyphName, glyphIndex):
+        threadNames.add(threading.current_thread().name)
+        return getGlyph(glyphName, glyphIndex)
+
+    monkeypatch.setattr(writableTestFont, "_getGlyph", recordingGetGlyph)
+    glyphMap = await writableTestFont.getGlyphMap()
+    referenceFont = getFileSystemBackend(writableTestFont.path)
+    referenceGlyphs = {
+        glyphName: await referenceFont.getGlyph(glyphName)
+        for glyphName in ["A", "Adieresis"]
+    }
+
+    glyph = deepcopy(referenceGlyphs["A"])
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+
+    # Concurrent reads, and a write that has to wait for the first reads
+    results = await asyncio.gather(
+        writableTestFont.getGlyph("A"),
+        writableTestFont.getGlyph("Adieresis"),
+        writableTestFont.putGlyph("A", glyph, glyphMap["A"]),
+        writableTestFont.getGlyph("A"),
+    )
+    assert results[0] == referenceGlyphs["A"]
+    assert results[1] == referenceGlyphs["Adieresis"]
+    assert results[3] == glyph
+
+    assert threading.current_thread().name not in threadNames
+    assert all(name.startswith("fontra-glyphs-reader") for name in threadNames)
+    await writableTestFont.aclose()
+
+
+async def test_getGlyph_cancelledWhileReading(writableTestFont, monkeypatch):
+    readStarted = threading.Event()
+    finishRead = threading.Event()
+    getGlyph = writableTestFont._getGlyph
+
+    def blockingGetGlyph(glyphName, glyphIndex):
+        readStarted.set()
+        finishRead.wait()
+        return getGlyph(glyphName, glyphIndex)
+
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    monkeypatch.setattr(writableTestFont, "_getGlyph", blockingGetGlyph)
+    readTask = asyncio.create_task(writableTestFont.getGlyph("Adieresis"))
+    await asyncio.to_thread(readStarted.wait)
+    readTask.cancel()
+
+    # The write must wait for the reader thread, even though the read was
+    # cancelled
+    writeTask = asyncio.create_task(
+        writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+    )
+    await asyncio.sleep(0.05)
+    assert not readTask.done()
+    assert not writeTask.done()
+
+    finishRead.set()
+    with pytest.raises(asyncio.CancelledError):
+        await readTask
+    await writeTask
+    await writableTestFont.aclose()
+
+
+async def test_glyphMapSnapshot(writableTestFont):
+    snapshot = writableTestFont.getGlyphMapSnapshot()
+    infosSnapshot = writableTestFont.getGlyphInfosSnapshot()
+    assert writableTestFont.getGlyphMapSnapshot() is snapshot
+    assert snapshot.data == await writableTestFont.getGlyphMap()
+    assert infosSnapshot.data == await writableTestFont.getGlyphInfos()
+    with pytest.raises(TypeError):
+        snapshot.data["A"] = []
+
+    # The caller's copy can be changed without changing the snapshot
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyphMap["A"] = [0x42]
+    assert snapshot.data["A"] == [0x41]
+
+    glyph = await writableTestFont.getGlyph("A")
+    await writableTestFont.putGlyph("A", glyph, [0x41])
+    assert writableTestFont.getGlyphMapSnapshot() is snapshot
+
+    await writableTestFont.putGlyph("A", glyph, [0x41, 0x61])
+    newSnapshot = writableTestFont.getGlyphMapSnapshot()
+    assert newSnapshot.version > snapshot.version
+    assert newSnapshot.data["A"] == [0x41, 0x61]
+    assert snapshot.data["A"] == [0x41]
+
+    await writableTestFont.deleteGlyph("A")
+    assert "A" not in writableTestFont.getGlyphMapSnapshot().data
+    assert writableTestFont.getGlyphMapSnapshot().version > newSnapshot.version
+    assert writableTestFont.getGlyphInfosSnapshot() is infosSnapshot
+
+
+async def test_getGlyphMap_changeResult(writableTestFont):
+    # Fontra's font handler applies glyph map changes to the dict it gets
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyphInfos = await writableTestFont.getGlyphInfos()
+    glyphMap["A.alt"] = [0x1234]
+    del glyphMap["A"]
+    glyphInfos["A.alt"] = {"category": "Letter"}
+
+    assert "A" in writableTestFont.glyphMap
+    assert "A.alt" not in writableTestFont.glyphMap
+    assert "A.alt" not in writableTestFont.glyphInfos
+    newGlyphMap = await writableTestFont.getGlyphMap()
+    assert "A" in newGlyphMap
+    assert "A.alt" not in newGlyphMap
+    assert "A.alt" not in await writableTestFont.getGlyphInfos()
+
+
+async def test_deleteGlyph_glyphInfos(tmpdir):
+    tmpdir = pathlib.Path(tmpdir)
+    fontPath = tmpdir / glyphs3Path.name
+    fontPath.write_text(
+        glyphs3Path.read_text().replace(
+            'category = "";\ncolor', "category = Letter;\ncolor", 1
+        )
+    )
+    testFont = getFileSystemBackend(fontPath)
+    infosSnapshot = testFont.getGlyphInfosSnapshot()
+    assert infosSnapshot.data["A"] == {"category": "Letter"}
+
+    await testFont.deleteGlyph("A")
+    assert "A" not in await testFont.getGlyphInfos()
+    assert testFont.getGlyphInfosSnapshot().version > infosSnapshot.version
+    assert "A" in infosSnapshot.data
+
+
+async def test_glyphDigests(writableTestFont):
+    listenerFont = getFileSystemBackend(writableTestFont.path)
+    digest = writableTestFont.getGlyphDigest("A")
+    assert digest is not None
+    assert listenerFont.getGlyphDigest("A") == digest
+    assert writableTestFont.getGlyphDigest("A") != writableTestFont.getGlyphDigest("B")
+    assert writableTestFont.getGlyphDigest("nonexistent") is None
+
+    glyphMap = await writableTestFont.getGlyphMap()
+    glyph = await writableTestFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+    await writableTestFont.putGlyph("A", glyph, glyphMap["A"])
+
+    newDigest = writableTestFont.getGlyphDigest("A")
+    assert newDigest != digest
+
+    # The digests are those of the glyph records on disk
+    reopened = getFileSystemBackend(writableTestFont.path)
+    for glyphName in glyphMap:
+        assert reopened.getGlyphDigest(glyphName) == writableTestFont.getGlyphDigest(
+            glyphName
+        )
+
+    if isinstance(writableTestFont, GlyphsPackageBackend):
+        changedPath = writableTestFont.getGlyphFilePath("A")
+        assert glyphTextDigest(changedPath.read_bytes()) == newDigest
+    else:
+        changedPath = writableTestFont.path
+    changes = {(Change.modified, str(changedPath))}
+    reloadPattern = await listenerFont.fileWatcherProcessChanges(changes)
+    assert reloadPattern == {"glyphs": {"A": None}}
+    assert listenerFont.getGlyphDigest("A") == newDigest
+
+
 async def setupFontHandler(backend):
     fh = FontHandler(
         backend=backend,
@@ -1097,6 +1876,102 @@ async def test_externalChanges_putFeatures(writableTestFont):
         assert features == listenerFeatures
 
 
+async def test_externalChanges_glyphsPackage_targetedReload(tmpdir, monkeypatch):
+    writerFont = _getCopiedBackend(glyphsPackagePath, tmpdir)
+    listenerFont = getFileSystemBackend(writerFont.path)
+
+    glyphMap = await writerFont.getGlyphMap()
+    glyph = await writerFont.getGlyph("A")
+    for layer in glyph.layers.values():
+        layer.glyph.xAdvance = 500
+    newGlyph = deepcopy(glyph)
+    newGlyph.name = "A.alt"
+
+    async with aclosing(writerFont):
+        await writerFont.putGlyph("A", glyph, glyphMap["A"] + [0x1234])
+        await writerFont.putGlyph("A.alt", newGlyph, [])
+        await writerFont.deleteGlyph("h")
+
+    readPaths = []
+
+    def recording(readFunc):
+        def recordingReadFunc(path):
+            readPaths.append(path)
+            return readFunc(path)
+
+        return recordingReadFunc
+
+    monkeypatch.setattr(
+        "fontra_glyphs.backend.openstepPlistFromPath",
+        recording(openstepPlistFromPath),
+    )
+    monkeypatch.setattr(
+        "fontra_glyphs.backend.openstepPlistAndDigestFromPath",
+        recording(openstepPlistAndDigestFromPath),
+    )
+    changes = {
+        (Change.modified, str(writerFont.getGlyphFilePath("A"))),
+        (Change.added, str(writerFont.getGlyphFilePath("A.alt"))),
+        (Change.deleted, str(writerFont.getGlyphFilePath("h"))),
+        (Change.modified, str(writerFont.orderPath)),
+    }
+    reloadPattern = await listenerFont.fileWatcherProcessChanges(changes)
+
+    # "h" was in kerning groups
+    assert reloadPattern == {
+        "glyphs": {"A": None, "A.alt": None, "h": None},
+        "glyphMap": None,
+        "kerning": None,
+    }
+    assert len(readPaths) == 3
+
+    monkeypatch.undo()
+    reopened = getFileSystemBackend(writerFont.path)
+    assert await listenerFont.getGlyphMap() == await reopened.getGlyphMap()
+    assert await listenerFont.getGlyph("A") == glyph
+    assert await listenerFont.getGlyph("A.alt") == newGlyph
+    assert await listenerFont.getGlyph("h") is None
+    assert await listenerFont.getKerning() == await reopened.getKerning()
+
+
+@pytest.mark.parametrize("sourcePath", [glyphs3Path, glyphsPackagePath])
+async def test_externalChanges_fontData_reloadPattern(tmpdir, sourcePath):
+    writerFont = _getCopiedBackend(sourcePath, tmpdir)
+    listenerFont = getFileSystemBackend(writerFont.path)
+    fontDataPath = (
+        writerFont.fontInfoPath
+        if isinstance(writerFont, GlyphsPackageBackend)
+        else writerFont.path
+    )
+    changes = {(Change.modified, str(fontDataPath))}
+
+    async with aclosing(writerFont):
+        kerning = await writerFont.getKerning()
+        kerning["kern"].values["@A"]["@J"][1] = 999
+        await writerFont.putKerning(kerning)
+
+        reloadPattern = await listenerFont.fileWatcherProcessChanges(changes)
+        assert reloadPattern == {"kerning": None}
+        assert await listenerFont.getKerning() == kerning
+
+        features = await writerFont.getFeatures()
+        features.text += "\nfeature test {\nsub A by a;\n} test;\n"
+        await writerFont.putFeatures(features)
+
+        reloadPattern = await listenerFont.fileWatcherProcessChanges(changes)
+        assert reloadPattern == {"features": None}
+        assert await listenerFont.getFeatures() == features
+
+    rawFontData = openstepPlistFromPath(fontDataPath)
+    rawFontData["fontMaster"][0]["name"] = "Renamed Master"
+    fontDataPath.write_text(openstepPlistDumps(rawFontData), encoding="utf-8")
+
+    reloadPattern = await listenerFont.fileWatcherProcessChanges(changes)
+    assert reloadPattern is None
+    sources = await listenerFont.getSources()
+    assert "Renamed Master" in [source.name for source in sources.values()]
+
+
 async def test_externalChanges_includedFeatureFile(externalFeaturesFileFont):
     listenerFont = getFileSystemBackend(externalFeaturesFileFont.path)
     listenerHandler = await setupFontHandler(listenerFont)
@@ -1740,6 +2615,73 @@ async def test_modify_kerning(writableRTLTestFont):
     assert kernSides == reopenedKernSides
 
 
+async def test_modify_kerning_groups(writableTestFont):
+    kerning = await writableTestFont.getKerning()
+    groupsSide1 = kerning["kern"].groupsSide1
+    groupName = sorted(groupsSide1)[0]
+    movedGlyphName = groupsSide1[groupName].pop(0)
+    groupsSide1["moved"] = [movedGlyphName]
+
+    await writableTestFont.putKerning(kerning)
+    assert writableTestFont.kerningGroupsByGlyph["left"][movedGlyphName] == "moved"
+
+    reopened = getFileSystemBackend(writableTestFont.path)
+    reopenedKerning = await reopened.getKerning()
+    assert reopenedKerning["kern"].groupsSide1["moved"] == [movedGlyphName]
+    assert movedGlyphName not in reopenedKerning["kern"].groupsSide1.get(groupName, [])
+    assert reopened.kerningGroupsByGlyph == writableTestFont.kerningGroupsByGlyph
+
+
+async def test_getKerning_cached(writableTestFont):
+    kerning = await writableTestFont.getKerning()
+    assert writableTestFont._cachedKerning is not None
+    kerning["kern"].values["@A"]["@V"][0] = 1234
+    kerning["kern"].groupsSide1["A"].append("B")
+
+    cachedKerning = await writableTestFont.getKerning()
+    assert cachedKerning["kern"].values["@A"]["@V"][0] != 1234
+    assert "B" not in cachedKerning["kern"].groupsSide1["A"]
+    assert cachedKerning == await writableTestFont._getKerning()
+
+    await writableTestFont.putKerning(kerning)
+    assert writableTestFont._cachedKerning is None
+    assert await writableTestFont.getKerning() == kerning
+
+
+async def test_updateKerning(writableTestFont):
+    kerning = await writableTestFont.getKerning()
+    sourceIdentifiers = kerning["kern"].sourceIdentifiers
+    newValues = [10 * (i + 1) for i in range(len(sourceIdentifiers))]
+    assert "@V" in kerning["kern"].values["@A"]
+    assert "@T" in kerning["kern"].values["@B"]
+
+    await writableTestFont.updateKerning(
+        "kern",
+        sourceIdentifiers,
+        values={"@A": {"@V": newValues}, "@B": {"@T": None}, "A": {"V": newValues}},
+        groupsSide1={"A": ["A", "a.sc"]},
+    )
+
+    expectedKerning = deepcopy(kerning["kern"])
+    expectedKerning.values["@A"]["@V"] = newValues
+    del expectedKerning.values["@B"]["@T"]
+    expectedKerning.values["A"] = {"V": newValues}
+    expectedKerning.groupsSide1["A"] = ["A", "a.sc"]
+    expectedKerning.groupsSide1["A.sc"] = []
+
+    assert (await writableTestFont.getKerning())["kern"] == expectedKerning
+
+    reopened = getFileSystemBackend(writableTestFont.path)
+    reopenedKerning = (await reopened.getKerning())["kern"]
+    assert reopenedKerning.values == expectedKerning.values
+    assert reopenedKerning.groupsSide1 == {
+        groupName: glyphNames
+        for groupName, glyphNames in expectedKerning.groupsSide1.items()
+        if glyphNames
+    }
+    assert reopenedKerning.groupsSide2 == expectedKerning.groupsSide2
+
+
 def extractKernSides(gsFont):
     return {
         glyph.name: (glyph.leftKerningGroup, glyph.rightKerningGroup)
@@ -1850,3 +2792,71 @@ async def test_smartComponent_compare_reference(
         glyph = await smartComponentsFont.getGlyph(glyphName)
         referenceGlyph = await smartComponentsReferenceFont.getGlyph(glyphName)
         assert glyph == referenceGlyph
+
+
+deferredModules = [
+    "glyphsLib",
+    "fontTools.designspaceLib",
+    "fontTools.feaLib",
+    "fontTools.ufoLib",
+]
+
+
+def test_heavyModulesNotImportedEagerly():
+    # Fontra imports all backend entry points at startup, the heavy modules must
+    # only be imported when a font is used
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fontra_glyphs.backend"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    importedModules = [
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+    assert "fontra_glyphs.backend" in importedModules
+    assert [
+        moduleName
+        for moduleName in importedModules
+        if any(
+            moduleName == deferredModule or moduleName.startswith(deferredModule + ".")
+            for deferredModule in deferredModules
+        )
+    ] == []
+
+
+importTimeBudget = 0.2  # seconds
+
+importTimeScript = """
+import time
+
+# The modules that fontra_glyphs.backend imports when it is imported, so the
+# time of the imports of Fontra and the standard library isn't measured
+import asyncio, concurrent.futures, hashlib, multiprocessing, pickle, re
+import openstep_plist
+import fontTools.misc.transform
+import fontra.backends.base, fontra.backends.filewatcher
+import fontra.backends.includedfeaturefiles, fontra.backends.watchable
+import fontra.core.classes, fontra.core.discretevariationmodel, fontra.core.path
+import fontra.core.protocols, fontra.core.subprocess, fontra.core.threading
+import fontra.core.varutils
+
+t = time.perf_counter()
+import fontra_glyphs.backend
+print(time.perf_counter() - t)
+"""
+
+
+def test_importTime():
+    # A generous budget: the import itself takes a few tens of milliseconds,
+    # importing glyphsLib and feaLib as well takes several times that. This
+    # module already imported fontra_glyphs.backend, so it is compiled.
+    result = subprocess.run(
+        [sys.executable, "-c", importTimeScript],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert float(result.stdout) < importTimeBudget
@@ -0,0 +1,131 @@
+import os
+import pathlib
+import shutil
+
+import pytest
+
+from fontra_glyphs.parsecache import ParseCache
+from fontra_glyphs.utils import openstepPlistAndDigestFromPath, openstepPlistFromPath
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+
+
+@pytest.fixture
+def fontPath(tmpdir):
+    srcPath = dataDir / "GlyphsUnitTestSans3.glyphspackage"
+    dstPath = pathlib.Path(tmpdir) / srcPath.name
+    shutil.copytree(srcPath, dstPath)
+    return dstPath
+
+
+@pytest.fixture
+def cacheDir(tmpdir):
+    return pathlib.Path(tmpdir) / "cache"
+
+
+def glyphPaths(fontPath):
+    return sorted((fontPath / "glyphs").glob("*.glyph"))
+
+
+def loadGlyphs(cacheDir, fontPath):
+    parseCache = ParseCache(cacheDir, fontPath)
+    glyphs = [parseCache.openstepPlistFromPath(path) for path in glyphPaths(fontPath)]
+    return parseCache, glyphs
+
+
+def test_parseCache(cacheDir, fontPath):
+    parseCache, glyphs = loadGlyphs(cacheDir, fontPath)
+    assert parseCache.hadMisses
+    assert parseCache.getDerivedData("glyphNames") is None
+    parseCache.setDerivedData("glyphNames", [g["glyphname"] for g in glyphs])
+    parseCache.save()
+
+    parseCache, cachedGlyphs = loadGlyphs(cacheDir, fontPath)
+    assert not parseCache.hadMisses
+    assert cachedGlyphs == glyphs
+    assert parseCache.getDerivedData("glyphNames") == [g["glyphname"] for g in glyphs]
+
+
+def test_parseCache_touchedFile(cacheDir, fontPath):
+    parseCache, _ = loadGlyphs(cacheDir, fontPath)
+    parseCache.setDerivedData("someData", 123)
+    parseCache.save()
+
+    glyphPath = fontPath / "glyphs" / "A_.glyph"
+    stat = os.stat(glyphPath)
+    os.utime(glyphPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    # Same content hash: still valid
+    parseCache, _ = loadGlyphs(cacheDir, fontPath)
+    assert not parseCache.hadMisses
+    assert parseCache.getDerivedData("someData") == 123
+
+
+def test_parseCache_modifiedFile(cacheDir, fontPath):
+    parseCache, _ = loadGlyphs(cacheDir, fontPath)
+    parseCache.setDerivedData("someData", 123)
+    parseCache.save()
+
+    glyphPath = fontPath / "glyphs" / "A_.glyph"
+    glyphPath.write_text(glyphPath.read_text().replace("unicode = 65;", ""))
+
+    parseCache, glyphs = loadGlyphs(cacheDir, fontPath)
+    assert parseCache.hadMisses
+    assert parseCache.getDerivedData("someData") is None
+    glyphData = glyphs[glyphPaths(fontPath).index(glyphPath)]
+    assert glyphData == openstepPlistFromPath(glyphPath)
+    assert "unicode" not in glyphData
+    parseCache.save()
+
+    # Only the modified file was parsed again, and derived data that wasn't
+    # updated is gone
+    parseCache = ParseCache(cacheDir, fontPath)
+    assert "someData" not in parseCache.derivedData
+    assert parseCache.get(glyphPath) == openstepPlistFromPath(glyphPath)
+
+
+def test_parseCache_put(cacheDir, fontPath):
+    glyphPath = fontPath / "glyphs" / "A_.glyph"
+    parseCache = ParseCache(cacheDir, fontPath)
+    stat = os.stat(glyphPath)
+    glyphData, digest = openstepPlistAndDigestFromPath(glyphPath)
+    parseCache.put(glyphPath, glyphData, stat, digest)
+    parseCache.save()
+
+    # The digest that was passed in is used to validate a touched file
+    os.utime(glyphPath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    parseCache = ParseCache(cacheDir, fontPath)
+    assert parseCache.get(glyphPath) == glyphData
+    assert not parseCache.hadMisses
+
+    # A file that changed after it was read isn't stored
+    glyphPath.write_text(glyphPath.read_text().replace("unicode = 65;", ""))
+    parseCache.put(glyphPath, glyphData, stat, digest)
+    assert parseCache.get(glyphPath) is None
+
+
+def test_parseCache_deletedFile(cacheDir, fontPath):
+    parseCache, glyphs = loadGlyphs(cacheDir, fontPath)
+    parseCache.setDerivedData("someData", 123)
+    parseCache.save()
+
+    glyphPath = fontPath / "glyphs" / "A_.glyph"
+    deletedIndex = glyphPaths(fontPath).index(glyphPath)
+    glyphPath.unlink()
+
+    parseCache, cachedGlyphs = loadGlyphs(cacheDir, fontPath)
+    del glyphs[deletedIndex]
+    assert cachedGlyphs == glyphs
+    assert parseCache.getDerivedData("someData") is None
+    parseCache.save()
+    assert len(ParseCache(cacheDir, fontPath).entries) == len(glyphs)
+
+
+def test_parseCache_corruptCacheFile(cacheDir, fontPath):
+    parseCache, glyphs = loadGlyphs(cacheDir, fontPath)
+    parseCache.save()
+    parseCache.cachePath.write_bytes(b"garbage")
+
+    parseCache, cachedGlyphs = loadGlyphs(cacheDir, fontPath)
+    assert parseCache.hadMisses
+    assert cachedGlyphs == glyphs
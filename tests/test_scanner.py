@@ -0,0 +1,114 @@
+import pathlib
+
+import openstep_plist
+import pytest
+
+from fontra_glyphs.scanner import (
+    GlyphsScanError,
+    UnparsedGlyphData,
+    findDictEnd,
+    glyphHeaderKeys,
+    scanGlyphRecord,
+    scanGlyphsFile,
+)
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+
+
+@pytest.mark.parametrize("path", sorted(dataDir.glob("*.glyphs")))
+def test_scanGlyphsFile(path):
+    data = path.read_bytes()
+    fontData, glyphRecords = scanGlyphsFile(data)
+
+    rawFontData = openstep_plist.loads(data.decode("utf-8"), use_numbers=True)
+    rawGlyphsData = rawFontData["glyphs"]
+    rawFontData["glyphs"] = []
+
+    assert openstep_plist.loads(fontData.decode("utf-8"), use_numbers=True) == (
+        rawFontData
+    )
+    assert len(glyphRecords) == len(rawGlyphsData)
+
+    for (start, end, header), glyphData in zip(glyphRecords, rawGlyphsData):
+        expectedHeader = {k: v for k, v in glyphData.items() if k in glyphHeaderKeys}
+        assert header == expectedHeader
+        unparsedGlyphData = UnparsedGlyphData(header, data[start:end])
+        assert unparsedGlyphData.parse() == glyphData
+
+    _, glyphSpans = scanGlyphsFile(data, scanHeaders=False)
+    assert glyphSpans == [(start, end, None) for start, end, _ in glyphRecords]
+
+
+def test_scanGlyphsFile_noGlyphs():
+    data = b"{\nfamilyName = Test;\n}\n"
+    assert scanGlyphsFile(data) == (data, [])
+
+    data = b"{\nfamilyName = Test;\nglyphs = (\n);\nunitsPerEm = 1000;\n}\n"
+    assert scanGlyphsFile(data) == (data.replace(b"(\n)", b"()"), [])
+
+
+def test_scanGlyphsFile_nestedGlyphsKey():
+    # Only the top-level "glyphs" key counts
+    data = (
+        b"{\nuserData = {\nglyphs = (\n{\nglyphname = x;\n}\n);\n};\n"
+        b"glyphs = (\n{\nglyphname = A;\n}\n);\n}\n"
+    )
+    fontData, glyphRecords = scanGlyphsFile(data)
+    assert [header for _, _, header in glyphRecords] == [{"glyphname": "A"}]
+
+
+scanGlyphRecordTestData = [
+    (b"{\nglyphname = A;\nunicode = 65;\n}", {"glyphname": "A", "unicode": 65}),
+    (
+        b'{\nglyphname = "A-cy";\nlayers = (\n{\nname = "}{";\n}\n);\nunicode = 1040;\n}',
+        {"glyphname": "A-cy", "unicode": 1040},
+    ),
+    (
+        b'{\nglyphname = a;\nnote = "{ \\" }";\nunicode = (97,65);\nuserData = {\n'
+        b"unicode = 1;\n};\n}",
+        {"glyphname": "a", "unicode": [97, 65]},
+    ),
+    (
+        b"{\nglyphname = n;\nkernLeft = n;\nkernRight = n;\nlayers = (\n);\n"
+        b"category = Letter;\nsubCategory = Lowercase;\n}",
+        {
+            "glyphname": "n",
+            "kernLeft": "n",
+            "kernRight": "n",
+            "category": "Letter",
+            "subCategory": "Lowercase",
+        },
+    ),
+    (
+        b'{\n"glyphname" = "a;b";\nlayers = (\n{\nshapes = (\n{\nnodes = (\n'
+        b"(1,2,l),\n(3,4,l)\n);\n}\n);\n}\n);\nunicode = 0061;\n}",
+        {"glyphname": "a;b", "unicode": 61},
+    ),
+]
+
+
+@pytest.mark.parametrize("text, expectedHeader", scanGlyphRecordTestData)
+def test_scanGlyphRecord(text, expectedHeader):
+    header, end = scanGlyphRecord(text)
+    assert header == expectedHeader
+    assert end == len(text)
+
+
+def test_findDictEnd():
+    data = b'({a = {b = "}";};}, {})'
+    assert findDictEnd(data, 1) == 18
+    assert findDictEnd(data, 20) == 22
+
+    with pytest.raises(GlyphsScanError):
+        findDictEnd(b"{a = {};", 0)
+
+
+def test_unparsedGlyphData_equality():
+    text = b"{\nglyphname = A;\nlayers = (\n);\n}"
+    unparsed = UnparsedGlyphData.fromText(text)
+    assert unparsed == {"glyphname": "A", "layers": []}
+    assert {"glyphname": "A", "layers": []} == unparsed
+    assert unparsed != {"glyphname": "A"}
+    assert [unparsed] == [{"glyphname": "A", "layers": []}]
+    assert unparsed == UnparsedGlyphData.fromText(text)
+    assert unparsed != UnparsedGlyphData.fromText(text.replace(b"A", b"B"))
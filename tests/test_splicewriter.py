@@ -0,0 +1,151 @@
+import pathlib
+from copy import deepcopy
+
+import openstep_plist
+import pytest
+
+from fontra_glyphs.splicewriter import SpliceWriter
+from fontra_glyphs.utils import (
+    convertMatchesToTuples,
+    matchTreeFont,
+    openstepPlistDumps,
+    openstepPlistDumpsGlyph,
+)
+
+dataDir = pathlib.Path(__file__).resolve().parent / "data"
+
+glyphs2Path = dataDir / "GlyphsUnitTestSans.glyphs"
+glyphs3Path = dataDir / "GlyphsUnitTestSans3.glyphs"
+
+
+def loadRawData(path):
+    rawFontData = openstep_plist.loads(path.read_text(), use_numbers=True)
+    rawGlyphsData = rawFontData["glyphs"]
+    rawFontData["glyphs"] = []
+    return rawFontData, rawGlyphsData
+
+
+def fullDumps(rawFontData, rawGlyphsData):
+    rawFontData = dict(rawFontData)
+    rawFontData["glyphs"] = rawGlyphsData
+    return openstepPlistDumps(convertMatchesToTuples(rawFontData, matchTreeFont))
+
+
+def modifyGlyph(rawGlyphData):
+    rawGlyphData = deepcopy(rawGlyphData)
+    rawGlyphData["note"] = "a somewhat longer note, to change the size"
+    return rawGlyphData
+
+
+def renameGlyph(rawGlyphData, glyphName):
+    rawGlyphData = deepcopy(rawGlyphData)
+    rawGlyphData["glyphname"] = glyphName
+    return rawGlyphData
+
+
+@pytest.fixture(params=[glyphs2Path, glyphs3Path])
+def rawData(request):
+    return loadRawData(request.param)
+
+
+def test_fromRawData(rawData):
+    rawFontData, rawGlyphsData = rawData
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, rawGlyphsData)
+    assert writer.glyphNames == [g["glyphname"] for g in rawGlyphsData]
+    for (start, end), glyphData in zip(writer.glyphSpans, rawGlyphsData):
+        glyphText = writer.data[start:end].decode("utf-8") + "\n"
+        assert glyphText == openstepPlistDumpsGlyph(glyphData)
+
+
+def test_fromRawData_roundtrip():
+    rawFontData, rawGlyphsData = loadRawData(glyphs3Path)
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+    assert writer.data == glyphs3Path.read_bytes()
+
+
+@pytest.mark.parametrize("index", [0, 1, -1])
+def test_replaceGlyph(rawData, index):
+    rawFontData, rawGlyphsData = rawData
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+
+    rawGlyphsData[index] = modifyGlyph(rawGlyphsData[index])
+    writer.replaceGlyph(
+        rawGlyphsData[index]["glyphname"], openstepPlistDumpsGlyph(rawGlyphsData[index])
+    )
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, rawGlyphsData)
+
+
+@pytest.mark.parametrize("index", [0, 1, 5, None])
+def test_insertGlyph(rawData, index):
+    rawFontData, rawGlyphsData = rawData
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+
+    if index is None:
+        index = len(rawGlyphsData)
+    newGlyph = renameGlyph(rawGlyphsData[1], "b.new")
+    rawGlyphsData.insert(index, newGlyph)
+    writer.insertGlyph(index, "b.new", openstepPlistDumpsGlyph(newGlyph))
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, rawGlyphsData)
+    assert writer.glyphNames == [g["glyphname"] for g in rawGlyphsData]
+
+
+@pytest.mark.parametrize("index", [0, 1, -1])
+def test_deleteGlyph(rawData, index):
+    rawFontData, rawGlyphsData = rawData
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+
+    glyphName = rawGlyphsData[index]["glyphname"]
+    del rawGlyphsData[index]
+    writer.deleteGlyph(glyphName)
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, rawGlyphsData)
+
+
+def test_deleteAll_insertGlyph(rawData):
+    rawFontData, rawGlyphsData = rawData
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+
+    firstGlyph = rawGlyphsData[0]
+    for glyphData in rawGlyphsData:
+        writer.deleteGlyph(glyphData["glyphname"])
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, [])
+
+    writer.insertGlyph(0, firstGlyph["glyphname"], openstepPlistDumpsGlyph(firstGlyph))
+    assert writer.data.decode("utf-8") == fullDumps(rawFontData, [firstGlyph])
+
+
+def test_write(tmpdir, rawData):
+    rawFontData, rawGlyphsData = rawData
+    path = pathlib.Path(tmpdir) / "test.glyphs"
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+    writer.write(path)
+    assert path.read_bytes() == writer.data
+
+    # Same size
+    writer.replaceGlyph(
+        rawGlyphsData[2]["glyphname"], openstepPlistDumpsGlyph(rawGlyphsData[2])
+    )
+    writer.write(path)
+    assert path.read_bytes() == writer.data
+
+    # Grow, then shrink
+    for glyphData in [modifyGlyph(rawGlyphsData[2]), rawGlyphsData[2]]:
+        writer.replaceGlyph(glyphData["glyphname"], openstepPlistDumpsGlyph(glyphData))
+        writer.write(path)
+        assert path.read_bytes() == writer.data
+
+    assert path.read_text() == fullDumps(rawFontData, rawGlyphsData)
+
+
+def test_write_externallyModified(tmpdir, rawData):
+    rawFontData, rawGlyphsData = rawData
+    path = pathlib.Path(tmpdir) / "test.glyphs"
+    writer = SpliceWriter.fromRawData(rawFontData, rawGlyphsData)
+    writer.write(path)
+
+    path.write_text("garbage")
+
+    glyphData = modifyGlyph(rawGlyphsData[-1])
+    writer.replaceGlyph(glyphData["glyphname"], openstepPlistDumpsGlyph(glyphData))
+    writer.write(path)
+    assert path.read_bytes() == writer.data